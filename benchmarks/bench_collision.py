@@ -0,0 +1,96 @@
+"""Per-frame collision cost: full class scan vs. query_rect() vs. collide_many(),
+without and with the grid.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/bench_collision.py
+
+Every projectile looks for the invaders it collides with, once by walking all
+the invaders (what RocketProjectile used to do every tick), once through
+the spatial grid and twice with the batched collide_many(), testing all the pairs
+or only those the grid finds in the same cells. Nothing gets destroyed so all
+sides time the same frame.
+
+"""
+
+import argparse
+import random
+import timeit
+
+from spaceinvaders.collision         import collide_many
+from spaceinvaders.invader           import Invader
+from spaceinvaders.rocket_projectile import RocketProjectile
+from spaceinvaders.vector            import Vector
+from spaceinvaders.world             import World
+
+WIDTH  = 160
+HEIGHT = 120
+
+
+def scatter(sprite):
+    target = Vector(float(random.randrange(0, WIDTH)), float(random.randrange(0, HEIGHT)))
+    sprite.teleport(Vector(target.x - sprite.x, target.y - sprite.y))
+
+
+def populate(invaders, projectiles):
+    world = World()
+    manager = world.manager
+    for i in range(invaders):
+        invader = Invader(world)
+        manager.attach(invader)
+        scatter(invader)
+    for i in range(projectiles):
+        projectile = RocketProjectile(world)
+        manager.attach(projectile)
+        scatter(projectile)
+    return manager
+
+
+def full_scan(manager):
+    hits = 0
+    for projectile in manager.get("RocketProjectile"):
+        for invader in manager.get("Invader"):
+            if projectile.collide_with(invader) or invader.collide_with(projectile):
+                hits += 1
+    return hits
+
+
+def grid_scan(manager):
+    hits = 0
+    for projectile in manager.get("RocketProjectile"):
+        invaders = manager.query_rect(projectile.tlc(), projectile.width, projectile.height, "Invader")
+        for invader in invaders:
+            if projectile.collide_with(invader) or invader.collide_with(projectile):
+                hits += 1
+    return hits
+
+
+def batched(manager, grid=None):
+    return len(collide_many(manager.get("RocketProjectile"), manager.get("Invader"), grid))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed",   type=int, default=0)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"{'invaders':>8} {'projectiles':>11} {'hits':>5} {'full scan':>12} {'grid':>12} {'batched':>12}"
+          f" {'batched+grid':>13}")
+    for (invaders, projectiles) in [(50, 50), (100, 100), (200, 200), (400, 400)]:
+        manager = populate(invaders, projectiles)
+        hits = full_scan(manager)
+        assert hits == grid_scan(manager), "Grid and full scan disagree"
+        assert hits == batched(manager),   "Batched test and full scan disagree"
+        assert hits == batched(manager, manager.grid), "Batched test and grid disagree"
+        full  = timeit.timeit(lambda: full_scan(manager), number=args.frames) / args.frames
+        grid  = timeit.timeit(lambda: grid_scan(manager), number=args.frames) / args.frames
+        batch = timeit.timeit(lambda: batched(manager),   number=args.frames) / args.frames
+        both  = timeit.timeit(lambda: batched(manager, manager.grid), number=args.frames) / args.frames
+        print(f"{invaders:>8} {projectiles:>11} {hits:>5} {full * 1000:>9.2f} ms {grid * 1000:>9.2f} ms"
+              f" {batch * 1000:>9.2f} ms {both * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Encodes per second of Encoder, against walking the sprites in Python.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/bench_encoder.py
+
+The same seeded world is stepped --warmup times with random buttons, once in
+each storage, then encoded --encodes times with every layout, and compared with
+a naive encoding which builds new lists and arrays out of the sprite manager's
+lists. Bytes are the peak allocated by one encode, as seen by tracemalloc. Lower
+--invader-period for crowded screens, e.g., 2 for hundreds of invaders.
+
+Beforehand, the encodings of both storages and the naive one must be equal
+arrays, tick after tick, for --check ticks, the grid being also built from the
+storage's arrays however few sprites are on it. It's checked at the benchmarked
+--invader-period, then on a crowded screen, where sprites as near as each other
+are common.
+
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from math import ceil, floor
+
+import numpy as np
+
+import spaceinvaders.world
+
+from spaceinvaders.backend import use_headless
+from spaceinvaders.encoder import FEATURES, GRID, Encoder
+from spaceinvaders.world   import World
+
+
+def naive(encoder):
+    """Encode the world like a first draft would, allocating as it goes."""
+    (world, k, cell) = (encoder.world, encoder.k, encoder.cell)
+    (width, height) = (encoder.width, encoder.height)
+    rocket = world.rocket
+    if encoder.layout == FEATURES:
+        features = [rocket.x / width, rocket.y / height,
+                    world.life_bar.hit_points / world.life_bar.MAX_HIT_POINTS, rocket.weapon.ready()]
+        for name in encoder.classes:
+            nearest = sorted((((s.x - rocket.x) ** 2 + (s.y - rocket.y) ** 2, s.x - rocket.x, s.y - rocket.y)
+                              for s in world.manager.get(name)))[:k]
+            for (d2, dx, dy) in nearest:
+                features += [dx / width, dy / height, 1]
+            features += [0, 0, 0] * (k - len(nearest))
+        return np.array(features, dtype=np.float32)
+
+    (rows, cols) = (ceil(height / cell), ceil(width / cell))
+    grid = np.zeros((len(encoder.classes), rows, cols), dtype=np.uint8)
+    for (c, name) in enumerate(encoder.classes):
+        for s in world.manager.get(name):
+            r0 = min(max(floor(s.top / cell), 0), rows)
+            r1 = min(max(ceil(s.bottom / cell), 0), rows)
+            c0 = min(max(floor(s.left / cell), 0), cols)
+            c1 = min(max(ceil(s.right / cell), 0), cols)
+            grid[c, r0:r1, c0:c1] = 1
+    return grid
+
+
+def measure(encode, count):
+    """Encodes per second and peak bytes of one encode."""
+    start = time.perf_counter()
+    for i in range(count):
+        encode()
+    rate = count / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    encode()
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (rate, peak)
+
+
+# Invader period of the crowded screen encodings are checked on:
+CROWDED = 2
+
+
+def step(worlds, pilot):
+    """Step WORLDS, one per storage, with the same random buttons."""
+    mask = pilot.randrange(0, 8)
+    for world in worlds:
+        world.step(mask)
+
+
+def check(seed, ticks):
+    """Assert the encodings of both storages and the naive one are equal, for
+    TICKS ticks of a game seeded with SEED."""
+    worlds = [World(seed, soa=soa) for soa in (False, True)]
+    pilot = random.Random(seed)
+    for tick in range(ticks):
+        step(worlds, pilot)
+        check_tick(worlds, tick)
+
+
+def check_tick(worlds, tick):
+    for layout in (FEATURES, GRID):
+        (objects, soa) = (Encoder(world, layout) for world in worlds)
+        arrays = Encoder(worlds[1], layout)
+        arrays.WALK_LIMIT = -1
+        expected = naive(objects)
+        for (name, encoder) in [("objects", objects), ("soa", soa), ("soa arrays", arrays)]:
+            assert np.array_equal(encoder.encode(), expected), \
+                f"{layout} encoding with {name} differs from the naive one at tick {tick}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--warmup",  type=int, default=600)
+    parser.add_argument("--encodes", type=int, default=2000)
+    parser.add_argument("--seed",    type=int, default=0)
+    parser.add_argument("--check",   type=int, default=300)
+    parser.add_argument("--invader-period", type=int, default=spaceinvaders.world.INVADER_PERIOD)
+    args = parser.parse_args()
+
+    use_headless()
+    for period in (CROWDED, args.invader_period):
+        spaceinvaders.world.INVADER_PERIOD = period
+        check(args.seed, args.check)
+    print(f"encodings equal in both storages and to the naive one for {args.check} ticks")
+
+    worlds = [World(args.seed, soa=soa) for soa in (False, True)]
+    pilot = random.Random(args.seed)
+    for tick in range(args.warmup):
+        step(worlds, pilot)
+
+    print(f"{'layout':>8} {'storage':>7} {'sprites':>7} {'encodes/sec':>12} {'bytes':>7}"
+          f" {'naive/sec':>10} {'bytes':>7} {'speedup':>8}")
+    for (soa, world) in zip((False, True), worlds):
+        sprites = sum(len(plan) for plan in world.manager.plans)
+
+        for layout in (FEATURES, GRID):
+            encoder = Encoder(world, layout)
+            (rate, peak) = measure(encoder.encode, args.encodes)
+            (naive_rate, naive_peak) = measure(lambda: naive(encoder), args.encodes)
+            storage = "soa" if soa else "objects"
+            print(f"{layout:>8} {storage:>7} {sprites:>7} {rate:>12,.0f} {peak:>7,}"
+                  f" {naive_rate:>10,.0f} {naive_peak:>7,} {rate / naive_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
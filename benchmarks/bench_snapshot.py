@@ -0,0 +1,152 @@
+"""Cost of snapshotting and restoring a game, and of keeping snapshots to rewind.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/bench_snapshot.py
+
+A seeded headless game is stepped for --frames frames, with INVADERS extra
+invaders spread along their path, then snapshotted. The rewind buffer is fed a
+snapshot every --period frames of another --frames frames.
+
+Beforehand, for --check ticks of a game flown with random buttons, snapshots
+must be the same bytes in both storages, tick after tick, and so must games
+restored from them, in either storage, and played on. A session logged with
+random buttons, rewinds included, must also be played back to the same bytes
+twice, and seeking back and forth within it must land on them too.
+
+"""
+
+import argparse
+import random
+import timeit
+
+from spaceinvaders.backend        import pyxel, use_headless
+from spaceinvaders.controls       import BITS, Controls
+from spaceinvaders.headless       import sweep
+from spaceinvaders.invader        import Invader
+from spaceinvaders.replay         import START_GAME, Log, Player
+from spaceinvaders.snapshot       import Rewind
+from spaceinvaders.world          import World
+
+# Ticks between two snapshots restored into new games:
+ROUND_TRIP_PERIOD = 50
+
+# Ticks between two checkpoints of the replay player:
+CHECKPOINT_PERIOD = 30
+
+
+def check_round_trips(seed, ticks):
+    """Assert snapshots are the same bytes in both storages, and once restored,
+    for TICKS ticks of a game seeded with SEED."""
+    worlds = [World(seed, soa=soa) for soa in (False, True)]
+    pilot = random.Random(seed)
+    for tick in range(ticks):
+        if tick % ROUND_TRIP_PERIOD == 0:
+            snapshot = worlds[0].manager.snapshot()
+            restored = [World(seed, soa=soa) for soa in (False, True)]
+            for world in restored:
+                world.manager.restore(snapshot)
+            worlds = worlds[:2] + restored
+
+        mask = pilot.randrange(0, 8)
+        for world in worlds:
+            world.step(mask)
+        snapshots = [world.manager.snapshot() for world in worlds]
+        assert all(snapshot == snapshots[0] for snapshot in snapshots), \
+            f"Snapshots differ at tick {tick}"
+
+
+def check_replays(seed, ticks):
+    """Assert a session of TICKS ticks, seeded with SEED, is played back to the
+    same snapshots twice, and when seeking within it."""
+    pilot = random.Random(seed)
+    masks = [0, BITS[pyxel.KEY_LEFT], BITS[pyxel.KEY_RIGHT], BITS[pyxel.KEY_UP],
+             BITS[pyxel.KEY_UP] | BITS[pyxel.KEY_LEFT], BITS[pyxel.KEY_BACKSPACE]]
+    runs = []
+    while sum(count for (mask, count) in runs) < ticks:
+        runs.append((pilot.choice(masks), pilot.randrange(1, 40)))
+    log = Log(seed, START_GAME, runs)
+
+    snapshots = []
+    for i in range(2):
+        player = Player(log, draw=False)
+        played = []
+        for tick in range(len(log)):
+            player.step()
+            played.append(player.mode.world.manager.snapshot())
+        player.close()
+        assert not snapshots or played == snapshots, "Snapshots differ when played back twice"
+        snapshots = played
+
+    player = Player(log, draw=False, period=CHECKPOINT_PERIOD)
+    player.seek(len(log))
+    for tick in pilot.sample(range(1, len(log) + 1), 20):
+        player.seek(tick)
+        assert player.mode.world.manager.snapshot() == snapshots[tick - 1], \
+            f"Snapshots differ when seeking tick {tick}"
+    player.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames",   type=int, default=300)
+    parser.add_argument("--invaders", type=int, default=100)
+    parser.add_argument("--period",   type=int, default=6)
+    parser.add_argument("--seed",     type=int, default=0)
+    parser.add_argument("--soa",      action="store_true")
+    parser.add_argument("--check",    type=int, default=600)
+    args = parser.parse_args()
+
+    use_headless()
+    check_round_trips(args.seed, args.check)
+    check_replays(args.seed, args.check)
+    print(f"snapshots equal in both storages, restored and played back for {args.check} ticks")
+
+    headless = use_headless(script=sweep)
+    controls = Controls()
+
+    from spaceinvaders.game_mode import GameMode
+    mode = GameMode(controls, args.seed, args.soa)
+    world = mode.world
+    manager = world.manager
+    for i in range(args.invaders):
+        invader = manager.acquire(Invader)
+        invader.advance(world.rng.randrange(0, len(invader.path.moves)))
+        manager.attach(invader)
+
+    def step():
+        controls.poll()
+        mode.tick()
+        headless.step()
+
+    for frame in range(args.frames):
+        step()
+
+    sprites = sum(len(plan) for plan in manager.plans)
+    snapshot = manager.snapshot()
+    number = 200
+    dump = timeit.timeit(manager.snapshot, number=number) / number
+    restore = timeit.timeit(lambda: manager.restore(snapshot), number=number) / number
+
+    rewind = Rewind()
+    pushed = 0
+    push = 0.0
+    for frame in range(args.frames):
+        step()
+        if frame % args.period == 0:
+            snapshot = manager.snapshot()
+            push += timeit.timeit(lambda: rewind.push(frame, snapshot), number=1)
+            pushed += 1
+    get = timeit.timeit(lambda: rewind.get(-1), number=number) / number
+
+    print(f"sprites:        {sprites}")
+    print(f"snapshot:       {len(snapshot)} B ({len(snapshot) / sprites:.0f} B/sprite)")
+    print(f"snapshot():     {dump * 1e6:.0f} us")
+    print(f"restore():      {restore * 1e6:.0f} us")
+    print(f"Rewind.push():  {push / pushed * 1e6:.0f} us")
+    print(f"Rewind.get():   {get * 1e6:.0f} us (newest)")
+    print(f"rewind buffer:  {len(rewind)} snapshots, {rewind.nbytes() / len(rewind):.0f} B/snapshot")
+
+
+if __name__ == "__main__":
+    main()
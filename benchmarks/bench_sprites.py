@@ -0,0 +1,61 @@
+"""Memory footprint and update throughput of 10k live sprites.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/bench_sprites.py
+
+Sprites are built and updated without any window: only their constructors and
+Sprite.update() run, i.e., moving along their path and animating.
+
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from spaceinvaders.invader            import Invader
+from spaceinvaders.invader_projectile import InvaderProjectile
+from spaceinvaders.ufo                import UFO
+from spaceinvaders.world              import World
+
+
+def build(world, count):
+    sprites = []
+    while len(sprites) < count:
+        invader = Invader(world)
+        sprites.append(invader)
+        sprites.append(InvaderProjectile(world, invader))
+        sprites.append(UFO(world))
+    return sprites[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sprites", type=int, default=10000)
+    parser.add_argument("--frames",  type=int, default=100)
+    parser.add_argument("--seed",    type=int, default=0)
+    args = parser.parse_args()
+
+    world = World(args.seed)
+    gc.collect()
+    tracemalloc.start()
+    sprites = build(world, args.sprites)
+    (memory, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for frame in range(args.frames):
+        for sprite in sprites:
+            sprite.update()
+    elapsed = time.perf_counter() - start
+
+    updates = args.sprites * args.frames
+    print(f"sprites:        {args.sprites}")
+    print(f"memory:         {memory / 1024:.0f} KiB ({memory / args.sprites:.0f} B/sprite)")
+    print(f"updates/sec:    {updates / elapsed:,.0f}")
+    print(f"ms/frame:       {elapsed / args.frames * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    main()
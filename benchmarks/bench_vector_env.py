@@ -0,0 +1,121 @@
+"""Environment steps per second of VectorEnv, against as many World objects.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/bench_vector_env.py
+
+For every count in --worlds, a VectorEnv holding that many games is stepped
+--frames times, every game with its own random buttons, then the same number of
+World objects are stepped round-robin, for at most --world-frames frames.
+
+Beforehand, --check-worlds games of a VectorEnv are played in lockstep with as
+many World objects, in each storage, for --check frames, every game holding its
+own random buttons for a few frames: the rocket, its hit points and kills, the
+invaders and projectiles, the rewards and the games over must be the same.
+
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from spaceinvaders.backend    import use_headless
+from spaceinvaders.vector_env import VectorEnv
+from spaceinvaders.world      import World
+
+
+def ints(text):
+    return [int(n) for n in text.split(",")]
+
+
+# Buttons of the lockstep games, held until changed with that probability:
+BUTTONS = [0, 1, 2, 3, 4, 5, 6, 7]
+CHANGE  = 0.1
+
+
+def state(world):
+    """The rocket's x, hit points and kills, then the invaders' and projectiles'
+    positions in WORLD."""
+    manager = world.manager
+    return (world.rocket.x, world.life_bar.hit_points, world.rocket.kills,
+            *([(s.x, s.y) for s in manager.get(name)]
+              for name in ("Invader", "InvaderProjectile", "RocketProjectile")))
+
+
+def env_state(env, k):
+    """state() of the Kth game of ENV."""
+    def positions(group):
+        return [(float(x), float(y)) for (x, y, alive) in zip(group.x[k], group.y[k], group.alive[k])
+                if alive]
+    return (float(env.rocket_x[k]), int(env.hit_points[k]), int(env.kills[k]),
+            positions(env.invaders), positions(env.invader_projectiles),
+            positions(env.rocket_projectiles))
+
+
+def check(count, frames, soa):
+    """Assert COUNT games of a VectorEnv play the same as COUNT World objects,
+    seeded 0 to COUNT - 1, for FRAMES frames."""
+    env = VectorEnv(count)
+    worlds = [World(k, soa=soa) for k in range(count)]
+    pilots = [random.Random(k) for k in range(count)]
+    held = [0] * count
+    for frame in range(frames):
+        for (k, pilot) in enumerate(pilots):
+            if pilot.random() < CHANGE:
+                held[k] = pilot.choice(BUTTONS)
+        (observations, rewards, done) = env.step(np.array(held))
+        for (k, world) in enumerate(worlds):
+            (kills, hit_points) = (world.rocket.kills, world.life_bar.hit_points)
+            world.step(held[k])
+            where = f"game {k} at frame {frame}"
+            assert done[k] == world.is_over(), f"Games over differ in {where}"
+            if done[k]:
+                worlds[k] = World(k, soa=soa)
+                continue
+            assert env_state(env, k) == state(world), f"States differ in {where}"
+            reward = (world.rocket.kills - kills) - (hit_points - world.life_bar.hit_points) // 2
+            assert rewards[k] == reward, f"Rewards differ in {where}"
+    assert not any(group.dropped for group in env.groups), "Sprites were dropped"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worlds",       type=ints, default=[1, 16, 256, 1024])
+    parser.add_argument("--frames",       type=int, default=1000)
+    parser.add_argument("--world-frames", type=int, default=100)
+    parser.add_argument("--seed",         type=int, default=0)
+    parser.add_argument("--check",        type=int, default=2500)
+    parser.add_argument("--check-worlds", type=int, default=6)
+    args = parser.parse_args()
+
+    use_headless()
+    for soa in (False, True):
+        check(args.check_worlds, args.check, soa)
+    print(f"{args.check_worlds} games played the same as World for {args.check} frames, in both storages")
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'worlds':>6} {'VectorEnv steps/sec':>20} {'World steps/sec':>16} {'speedup':>8}")
+    for k in args.worlds:
+        masks = rng.integers(0, 8, size=(args.frames, k))
+
+        env = VectorEnv(k)
+        start = time.perf_counter()
+        for frame_masks in masks:
+            env.step(frame_masks)
+        vector = k * args.frames / (time.perf_counter() - start)
+
+        frames = min(args.frames, args.world_frames)
+        worlds = [World(args.seed + i) for i in range(k)]
+        start = time.perf_counter()
+        for frame_masks in masks[:frames].tolist():
+            for (world, mask) in zip(worlds, frame_masks):
+                world.step(mask)
+        scalar = k * frames / (time.perf_counter() - start)
+
+        print(f"{k:>6} {vector:>20,.0f} {scalar:>16,.0f} {vector / scalar:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
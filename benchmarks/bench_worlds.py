@@ -0,0 +1,78 @@
+"""Many independent worlds stepped in one loop, in one process.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/bench_worlds.py
+
+--worlds seeded worlds are built, then stepped --frames times each, round-robin,
+every world with its own random buttons. Building a world is compared with
+starting a process which only imports the game.
+
+Afterwards, the first --check worlds must hold the same bytes as worlds of the
+same seeds stepped alone with the same buttons, in both storages: stepping many
+worlds in one loop must not leak state from one into another.
+
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import time
+
+from spaceinvaders.backend import use_headless
+from spaceinvaders.world   import World
+
+
+def check(worlds, masks, count):
+    """Assert the first COUNT of WORLDS, stepped round-robin with MASKS, hold the
+    same snapshots as worlds stepped alone, in both storages."""
+    for (i, world) in enumerate(worlds[:count]):
+        snapshot = world.manager.snapshot()
+        for soa in (False, True):
+            alone = World(world.seed, soa=soa)
+            for frame_masks in masks:
+                alone.step(frame_masks[i])
+            storage = "soa" if soa else "objects"
+            assert alone.manager.snapshot() == snapshot, \
+                f"World {i} differs from the one stepped alone with {storage}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worlds", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed",   type=int, default=0)
+    parser.add_argument("--soa",    action="store_true")
+    parser.add_argument("--check",  type=int, default=8)
+    args = parser.parse_args()
+
+    use_headless()
+    start = time.perf_counter()
+    worlds = [World(args.seed + i, soa=args.soa) for i in range(args.worlds)]
+    build = (time.perf_counter() - start) / args.worlds
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import spaceinvaders.world"], check=True)
+    process = time.perf_counter() - start
+
+    pilot = random.Random(args.seed)
+    masks = [[pilot.randrange(0, 8) for world in worlds] for frame in range(args.frames)]
+    start = time.perf_counter()
+    for frame_masks in masks:
+        for (world, mask) in zip(worlds, frame_masks):
+            world.step(mask)
+    elapsed = time.perf_counter() - start
+
+    steps = args.worlds * args.frames
+    print(f"worlds:         {args.worlds}")
+    print(f"World():        {build * 1000:.2f} ms (process start-up: {process * 1000:.0f} ms)")
+    print(f"steps/sec:      {steps / elapsed:,.0f}")
+    print(f"deaths:         {sum(world.is_over() for world in worlds)}")
+
+    check(worlds, masks, args.check)
+    print(f"snapshots of {min(args.check, args.worlds)} worlds equal to worlds stepped alone, in both storages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Reproducible benchmark suite for the game loop, emitting JSON.
+
+Run from the repository root with:
+
+    PYTHONPATH=src python benchmarks/suite.py --output results.json
+
+Every scenario steps a headless game, seeded, with extra load on top of the
+regular waves: INVADERS invaders spread along their path at start, then every
+frame PROJECTILE_RATE rocket projectiles and STAR_DENSITY stars. The rocket never
+dies. Scenarios are the product of the --invaders, --projectile-rate and
+--star-density lists.
+
+The whole frame is timed, as well as its parts: SpriteManager.update (and,
+within it, collision handling and timers) and SpriteManager.draw. Path.next_move
+is timed on its own.
+
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import timeit
+from time import perf_counter
+
+from spaceinvaders.backend           import use_headless
+from spaceinvaders.controls          import Controls
+from spaceinvaders.game_mode         import GameMode
+from spaceinvaders.headless          import sweep
+from spaceinvaders.horizontal_speed  import HorizontalSpeed
+from spaceinvaders.invader           import Invader
+from spaceinvaders.path              import Path
+from spaceinvaders.rocket_projectile import RocketProjectile
+from spaceinvaders.star              import Star
+from spaceinvaders.vector            import Vector
+from spaceinvaders.vertical_speed    import VerticalSpeed
+
+
+def ints(text):
+    return [int(n) for n in text.split(",")]
+
+
+class Timer:
+    """Accumulate the time spent in a function."""
+
+    def __init__(self, function):
+        self.function = function
+        self.total = 0.0
+
+    def __call__(self, *args):
+        start = perf_counter()
+        result = self.function(*args)
+        self.total += perf_counter() - start
+        return result
+
+
+def add_load(manager, headless, projectile_rate, star_density):
+    """Attach this frame's extra projectiles and stars."""
+    for i in range(projectile_rate):
+        projectile = manager.acquire(RocketProjectile)
+        x = random.randrange(0, headless.width)
+        projectile.teleport(Vector(float(x) - projectile.x, 0.0))
+        manager.attach(projectile)
+    for i in range(star_density):
+        manager.attach(manager.acquire(Star))
+
+
+def run_scenario(invaders, projectile_rate, star_density, frames, seed, soa):
+    random.seed(seed)
+    headless = use_headless(script=sweep)
+    controls = Controls()
+    mode = GameMode(controls, seed, soa)
+    world = mode.world
+    manager = world.manager
+
+    # Keep the rocket alive so that every frame carries the same kind of load.
+    world.life_bar.hit_points = sys.maxsize
+
+    for i in range(invaders):
+        invader = manager.acquire(Invader)
+        invader.advance(random.randrange(0, len(invader.path.moves)))
+        manager.attach(invader)
+
+    # Time the parts of the frame by wrapping the manager's methods.
+    timers = {
+        "collisions": Timer(manager.handle_collisions),
+        "timers":     Timer(manager.run_timers),
+        "update":     Timer(manager.update),
+        "draw":       Timer(manager.draw),
+    }
+    for (name, method) in [("handle_collisions", "collisions"), ("run_timers", "timers"),
+                           ("update", "update"), ("draw", "draw")]:
+        setattr(manager, name, timers[method])
+
+    sprites = 0
+    start = perf_counter()
+    for frame in range(frames):
+        add_load(manager, headless, projectile_rate, star_density)
+        controls.poll()
+        mode = mode.next_mode()
+        mode.tick()
+        mode.draw()
+        headless.step()
+        sprites += sum(len(plan) for plan in manager.plans)
+    elapsed = perf_counter() - start
+
+    return {
+        "invaders":        invaders,
+        "projectile_rate": projectile_rate,
+        "star_density":    star_density,
+        "frames":          frames,
+        "seed":            seed,
+        "soa":             soa,
+        "mean_sprites":    sprites / frames,
+        "fps":             frames / elapsed,
+        "ms_per_frame": {
+            "frame": elapsed / frames * 1000,
+            **{name: timer.total / frames * 1000 for (name, timer) in timers.items()},
+        },
+    }
+
+
+def path_next_move(number):
+    """Mean time of one Path.next_move() call on an invader-like path, in ns."""
+    path = Path.runs([(32, VerticalSpeed(1.0)), (128, HorizontalSpeed(1.0)),
+                      (32, VerticalSpeed(1.0)), (128, HorizontalSpeed(-1.0))])
+    return timeit.timeit(path.next_move, number=number) / number * 1e9
+
+
+def version():
+    try:
+        from importlib.metadata import version
+        return version("space-invaders")
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--invaders",        type=ints, default=[0, 100, 400])
+    parser.add_argument("--projectile-rate", type=ints, default=[0, 4])
+    parser.add_argument("--star-density",    type=ints, default=[0, 8])
+    parser.add_argument("--frames",          type=int,  default=300)
+    parser.add_argument("--seed",            type=int,  default=0)
+    parser.add_argument("--soa",             action="store_true")
+    parser.add_argument("--output",          help="JSON file to write, stdout by default")
+    args = parser.parse_args()
+
+    scenarios = []
+    for (invaders, rate, density) in itertools.product(args.invaders, args.projectile_rate, args.star_density):
+        result = run_scenario(invaders, rate, density, args.frames, args.seed, args.soa)
+        print(f"invaders={invaders:<4} projectile_rate={rate:<3} star_density={density:<3} "
+              f"{result['fps']:8.1f} frames/sec", file=sys.stderr)
+        scenarios.append(result)
+
+    report = {
+        "version":   version(),
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+        "scenarios": scenarios,
+        "micro": {
+            "path_next_move_ns": path_next_move(1_000_000),
+        },
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
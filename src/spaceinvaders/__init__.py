@@ -1,5 +1,10 @@
 
 from logging import Formatter, getLogger, INFO, Logger, StreamHandler
+from os      import environ
+
+# Sanity checks in hot paths, e.g., on every Vector addition, are only run when
+# the SPACEINVADERS_DEBUG environment variable is set (and not under python -O).
+DEBUG: bool = __debug__ and "SPACEINVADERS_DEBUG" in environ
 
 # Initialize the logger
 LOGGER_NAME: str = "spaceinvaders"
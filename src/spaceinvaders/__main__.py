@@ -1,10 +1,118 @@
 
-from spaceinvaders.root import Root
+# First, so that startup is timed from here.
+from spaceinvaders.startup import StartupProfiler
+
+import sys
+from argparse import ArgumentParser
+
+from spaceinvaders.headless import PILOTS
+
+
+def parse_args():
+    parser = ArgumentParser(prog="space-invaders",
+                            description="Space Invaders written in Python with Pyxel.")
+    parser.add_argument("--headless", action="store_true",
+                        help="step a game without any window, as fast as possible, and print frames/sec")
+    parser.add_argument("--frames", type=int, default=1000,
+                        help="number of frames to step in headless mode, at most per game in a batch (default: %(default)s)")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="sweep",
+                        help="scripted input used in headless mode and batches (default: %(default)s)")
+    parser.add_argument("--batch", type=int, metavar="GAMES",
+                        help="play GAMES headless games across all CPUs and print a report of the runs")
+    parser.add_argument("--jobs", type=int,
+                        help="worker processes of a batch (default: one per CPU)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", dest="params",
+                        help="tune the rules of a batch's games, e.g., invader_period=20 (tunables: "
+                             "invader_period, star_period, ufo_period, invader_cooldown, hit_points)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write a batch's report to FILE as JSON (default: stdout)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile the game and write the trace to FILE (.csv or .json) on exit")
+    parser.add_argument("--sim-hz", type=int, default=30,
+                        help="simulation ticks per second (default: %(default)s)")
+    parser.add_argument("--render-hz", type=int, default=30,
+                        help="rendered frames per second (default: %(default)s)")
+    parser.add_argument("--soa", action="store_true",
+                        help="keep sprite positions in the structure-of-arrays storage")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the time spent starting up, import by import, up to the first frame")
+    parser.add_argument("--seed", type=int,
+                        help="seed the game's randomness, a random seed by default")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the session's input and seed to FILE")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay the session recorded in FILE without any window, and print ticks/sec")
+    args = parser.parse_args()
+
+    if args.record and args.seed is not None:
+        from spaceinvaders.replay import SEEDS
+        if args.seed not in SEEDS:
+            parser.error(f"argument --seed: can't record seed {args.seed}, out of [0, 2**64)")
+
+    if args.params:
+        from spaceinvaders.batch import parse_param
+        try:
+            args.params = dict(parse_param(param) for param in args.params)
+        except ValueError as e:
+            parser.error(f"argument --set: {e}")
+    return args
 
 
 def main():
-    root = Root()
-    root.run()
+    args = parse_args()
+
+    # Modules are imported where needed below, so that they're timed.
+    if args.startup_time:
+        StartupProfiler().enable()
+
+    if args.soa:
+        from spaceinvaders.world import World
+        World.soa = True
+
+    if args.profile:
+        from spaceinvaders.profiler import Profiler
+        Profiler().toggle()
+
+    from spaceinvaders.controls import Controls
+    from spaceinvaders.rng      import random_seed
+    seed = random_seed() if args.seed is None else args.seed
+    controls = Controls()
+
+    if args.record:
+        from spaceinvaders.replay import Recorder, START_GAME, START_MENU
+        start = START_GAME if args.headless else START_MENU
+        controls.record(Recorder(args.record, seed, start))
+
+    if args.batch:
+        import json
+        from spaceinvaders.batch import print_summary, run
+        report = run(args.batch, args.frames, args.pilot, args.seed or 0, args.soa, dict(args.params), args.jobs)
+        print_summary(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+            print()
+    elif args.replay:
+        from spaceinvaders.replay import run
+        (ticks, tps) = run(args.replay)
+        print(f"{ticks} ticks, {tps:.1f} ticks/sec")
+    elif args.headless:
+        from spaceinvaders.headless import run
+        fps = run(args.frames, PILOTS[args.pilot](seed), seed, controls)
+        print(f"{args.frames} frames, {fps:.1f} frames/sec")
+    else:
+        from spaceinvaders.root import Root
+        StartupProfiler().mark("imports")
+        root = Root(sim_hz=args.sim_hz, render_hz=args.render_hz, controls=controls, seed=seed)
+        root.run()
+
+    if args.record:
+        controls.record(None)
+
+    if args.profile:
+        Profiler().export(args.profile)
 
 
 if __name__ == "__main__":
@@ -1,27 +1,34 @@
 
-import pyxel
+from spaceinvaders.backend import pyxel
 
 # Animation Directions:
 LEFT_TO_RIGHT = 0
 TOP_TO_BOTTOM = 1
 
 
-class Animation:
-    """An animation is a list of COUNT frames of WIDTH x HEIGHT pixels each taken
+class AnimationClip:
+    """The frames of an animation: COUNT frames of WIDTH x HEIGHT pixels each taken
      from the image IMG starting at (ORIGX, ORIGY) following the given DIRECTION.
 
-    A loop animation (LOOP set to True) is an animation that keeps repeating itself, i.e., that won't stop by itself.
+    A loop clip (LOOP set to True) keeps repeating itself, i.e., won't stop by itself.
+    Each frame lasts FPS simulation ticks.
+
+    FRAMES holds the (u, v) coordinates of each frame in IMG. KEY holds the
+    arguments of compile_clip() which built the clip.
 
-    The animation speed is described by its FPS, i.e., frames per seconds.
+    Clips are immutable and interned: use compile_clip() to get one, never build
+    it directly, so that every animation of a sprite-sheet region shares one clip.
 
     """
 
-    def __init__(self,
-                 img, width, height, origx, origy, count,
-                 loop=True, direction=LEFT_TO_RIGHT, fps=5):
-        assert count >= 1, "Frame count must be greater than or equal to 1"
+    __slots__ = ("key", "img", "width", "height", "origx", "origy", "count", "loop", "direction",
+                 "fps", "frames")
 
-        # Config:
+    def __init__(self, key):
+        (img, width, height, origx, origy, count, loop, direction, fps) = key
+        assert count >= 1, "Frame count must be greater than or equal to 1"
+        assert fps >= 1, "A frame must last at least 1 tick"
+        self.key = key
         self.img = img
         self.width = width
         self.height = height
@@ -32,51 +39,120 @@ class Animation:
         self.direction = direction
         self.fps = fps
 
-        # State:
-        self.framex = origx
-        self.framey = origy
-        self.frame = 0
-        self.running = True
+        if direction == LEFT_TO_RIGHT:
+            self.frames = tuple((origx + i * width, origy) for i in range(count))
+        else:  # direction == TOP_TO_BOTTOM
+            self.frames = tuple((origx, origy + i * height) for i in range(count))
+
+    def frame(self, elapsed):
+        """Index of the frame shown ELAPSED ticks after the clip started."""
+        frame = elapsed // self.fps
+        if frame < self.count:
+            return frame
+        if self.loop:
+            return frame % self.count
+        return self.count - 1
+
+
+# Interned clips:
+_clips = {}   # (img, width, height, origx, origy, count, loop, direction, fps) => AnimationClip
+
 
-    def start(self):
-        self.running = True
+def compile_clip(img, width, height, origx, origy, count, loop=True, direction=LEFT_TO_RIGHT, fps=5):
+    """Interned clip with the given frames."""
+    key = (img, width, height, origx, origy, count, loop, direction, fps)
+    clip = _clips.get(key)
+    if clip is None:
+        clip = _clips[key] = AnimationClip(key)
+    return clip
 
-    def stop(self):
-        self.running = False
+
+class Animation:
+    """Play an AnimationClip, built from the same arguments as compile_clip().
+
+    The only per-animation state is START, the tick the clip started at: the
+    current frame is computed from it when needed, nothing changes from one tick
+    to the next.
+
+    Ticks are read from a CLOCK, e.g., the sprite manager's scheduler, which
+    the animation is bound to while its sprite is attached. An unbound animation
+    is frozen on its current frame: START is then relative to tick 0.
+
+    """
+
+    __slots__ = ("clip", "clock", "start")
+
+    def __init__(self,
+                 img, width, height, origx, origy, count,
+                 loop=True, direction=LEFT_TO_RIGHT, fps=5):
+        self.clip = compile_clip(img, width, height, origx, origy, count, loop, direction, fps)
+        self.clock = None
+        self.start = 0
+
+    @property
+    def img(self):
+        return self.clip.img
+
+    @property
+    def width(self):
+        return self.clip.width
+
+    @property
+    def height(self):
+        return self.clip.height
+
+    def now(self):
+        if self.clock is None:
+            return 0
+        return self.clock.tick
+
+    def reset(self, origx=None, origy=None):
+        """Rewind to the first frame, optionally moving the animation to (ORIGX, ORIGY)."""
+        if origx is not None or origy is not None:
+            clip = self.clip
+            self.clip = compile_clip(clip.img, clip.width, clip.height,
+                                     clip.origx if origx is None else origx,
+                                     clip.origy if origy is None else origy,
+                                     clip.count, clip.loop, clip.direction, clip.fps)
+        self.start = self.now()
 
     def restart(self):
-        self.frame = 0
-        self.running = True
-
-    def next_frame(self):
-        if not self.running:
-            return
-
-        if pyxel.frame_count % self.fps != 0:
-            return
-
-        self.frame += 1
-        if self.frame == self.count:
-            if self.loop:
-                self.frame = 0
-                if self.direction == LEFT_TO_RIGHT:
-                    self.framex = self.origx
-                else: # self.direction == TOP_TO_BOTTOM
-                    self.framey = self.origy
-            else:
-                self.stop()
-            return
-
-        if self.direction == LEFT_TO_RIGHT:
-            self.framex += self.width
-        else:  # self.direction == TOP_TO_BOTTOM
-            self.framey += self.height
+        self.reset()
+
+    def bind(self, clock):
+        """Play the animation along CLOCK's ticks from now on."""
+        self.unbind()
+        self.start += clock.tick
+        self.clock = clock
+
+    def unbind(self):
+        """Freeze the animation on its current frame, e.g., once detached."""
+        if self.clock is not None:
+            self.start -= self.clock.tick
+            self.clock = None
+
+    @property
+    def frame(self):
+        return self.clip.frame(self.now() - self.start)
+
+    @property
+    def running(self):
+        """False once a clip which doesn't loop showed all its frames."""
+        clip = self.clip
+        return clip.loop or (self.now() - self.start) // clip.fps < clip.count
+
+    def uv(self):
+        """(u, v) coordinates of the current frame in the image."""
+        clip = self.clip
+        return clip.frames[clip.frame(self.now() - self.start)]
 
     # Draw at the given top left corner's coordinates.
     def draw_at(self, tlc):
         (x, y) = tlc
+        (u, v) = self.uv()
+        clip = self.clip
         pyxel.blt(x, y,                     # (x, y) destination
-                  self.img,                 # numero image source
-                  self.framex, self.framey, # (x, y) source
-                  self.width, self.height,  # (largeur, hauteur) source et destination
-                  0)                        # couleur transparente
\ No newline at end of file
+                  clip.img,                 # numero image source
+                  u, v,                     # (x, y) source
+                  clip.width, clip.height,  # (largeur, hauteur) source et destination
+                  0)                        # couleur transparente
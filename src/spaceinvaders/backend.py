@@ -0,0 +1,38 @@
+
+import pyxel as _pyxel
+
+from spaceinvaders.headless import Headless
+
+
+class Backend:
+    """Forward every pyxel call to the active backend: pyxel itself, or a Headless
+    stand-in after use_headless().
+
+    Modules use it in place of the pyxel module:
+
+        from spaceinvaders.backend import pyxel
+
+    """
+
+    __slots__ = ("target",)
+
+    def __init__(self, target):
+        self.target = target
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+pyxel = Backend(_pyxel)
+
+
+def use_headless(width=160, height=120, script=None):
+    """Switch to a new headless backend and return it."""
+    headless = Headless(width, height, script)
+    pyxel.target = headless
+    return headless
+
+
+def use_pyxel():
+    """Switch back to pyxel."""
+    pyxel.target = _pyxel
@@ -0,0 +1,185 @@
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import isfinite
+from time import perf_counter
+
+import numpy as np
+
+# Frame costs are counted in log-spaced buckets, from 1 us to 1 s, so that the
+# workers send back a small histogram rather than every frame's cost.
+EDGES = np.geomspace(1e-6, 1.0, 121)
+
+# What a batch can tune, by name => (module, attribute, type, lowest value). Spawn
+# periods are rounded to thousandths of a tick, hence their lowest value.
+TUNABLES = {
+    "invader_period":   ("spaceinvaders.world",          "INVADER_PERIOD",         float, 0.001),
+    "star_period":      ("spaceinvaders.world",          "STAR_PERIOD",            float, 0.001),
+    "ufo_period":       ("spaceinvaders.world",          "UFO_PERIOD",             float, 0.001),
+    "invader_cooldown": ("spaceinvaders.invader_weapon", "InvaderWeapon.COOLDOWN", int,   0),
+    "hit_points":       ("spaceinvaders.life_bar",       "LifeBar.MAX_HIT_POINTS", int,   1),
+}
+
+
+def parse_param(param):
+    """Return the (name, value) of PARAM, a "NAME=VALUE" string.
+
+    Raise ValueError, with a message for the user, if NAME isn't in TUNABLES or
+    VALUE isn't a number of its type, down to its lowest value.
+
+    """
+    (name, _, text) = param.partition("=")
+    if name not in TUNABLES:
+        raise ValueError(f"unknown tunable '{name}', expected one of: {', '.join(TUNABLES)}")
+    (module, attribute, kind, lowest) = TUNABLES[name]
+    try:
+        value = int(text)
+    except ValueError:
+        if kind is int:
+            raise ValueError(f"{name} must be an integer, not '{text}'") from None
+        try:
+            value = float(text)
+        except ValueError:
+            value = None
+        if value is None or not isfinite(value):
+            raise ValueError(f"{name} must be a number, not '{text}'")
+    if value < lowest:
+        raise ValueError(f"{name} must be at least {lowest}, not {text}")
+    return (name, value)
+
+
+def tune(params):
+    """Apply PARAMS, a {tunable name: value} dictionary, to the game's rules."""
+    from importlib import import_module
+
+    for (name, value) in params.items():
+        (module, attribute, kind, lowest) = TUNABLES[name]
+        target = import_module(module)
+        (*path, attribute) = attribute.split(".")
+        for step in path:
+            target = getattr(target, step)
+        setattr(target, attribute, value)
+
+
+def simulate(task):
+    """Play one game, without any window, as fast as possible.
+
+    TASK is a (seed, frames, pilot, soa, params) tuple: the game is seeded with
+    SEED, flown by the PILOT named so, with the rules tuned by PARAMS, until the
+    rocket dies or FRAMES frames. Every frame runs one tick.
+
+    Every game is a world of its own, so that games don't leak into each other.
+
+    Return the game's results as a dictionary.
+
+    """
+    from spaceinvaders.backend   import use_headless
+    from spaceinvaders.controls  import Controls
+    from spaceinvaders.game_mode import GameMode
+    from spaceinvaders.headless  import PILOTS
+
+    (seed, frames, pilot, soa, params) = task
+    tune(params)
+    headless = use_headless(script=PILOTS[pilot](seed))
+    controls = Controls()
+    mode = GameMode(controls, seed, soa)
+    world = mode.world
+
+    costs = np.empty(frames)
+    played = 0
+    while played < frames and not world.is_over():
+        start = perf_counter()
+        controls.poll()
+        mode = mode.next_mode()
+        mode.tick()
+        mode.draw()
+        headless.step()
+        costs[played] = perf_counter() - start
+        played += 1
+    costs = costs[:played]
+
+    return {
+        "seed":          seed,
+        "ticks":         played,
+        "dead":          world.is_over(),
+        "kills":         world.rocket.kills,
+        "mean_frame_ms": costs.mean() * 1000,
+        "histogram":     np.histogram(costs, EDGES)[0],
+    }
+
+
+def summary(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        "mean": values.mean(),
+        "min":  values.min(),
+        "p50":  np.percentile(values, 50),
+        "p90":  np.percentile(values, 90),
+        "max":  values.max(),
+    }
+
+
+def percentile(histogram, q):
+    """Upper edge, in ms, of the bucket holding the Q-th percentile of HISTOGRAM."""
+    cumulative = np.cumsum(histogram)
+    i = np.searchsorted(cumulative, cumulative[-1] * q / 100)
+    return EDGES[i + 1] * 1000
+
+
+def merge(results, elapsed):
+    """One report out of the RESULTS of every game, played in ELAPSED seconds."""
+    histogram = sum(result["histogram"] for result in results)
+    frames = sum(result["ticks"] for result in results)
+    mean_ms = sum(result["mean_frame_ms"] * result["ticks"] for result in results) / frames
+    return {
+        "games":          len(results),
+        "deaths":         sum(result["dead"] for result in results),
+        "wall_seconds":   elapsed,
+        "games_per_sec":  len(results) / elapsed,
+        "frames_per_sec": frames / elapsed,
+        "survival_ticks": summary([result["ticks"] for result in results]),
+        "kills":          summary([result["kills"] for result in results]),
+        "frame_ms": {
+            "mean": mean_ms,
+            "p50":  percentile(histogram, 50),
+            "p99":  percentile(histogram, 99),
+        },
+        "results": [{name: value for (name, value) in result.items() if name != "histogram"}
+                    for result in results],
+    }
+
+
+def run(games, frames, pilot="random", seed=0, soa=False, params={}, jobs=None):
+    """Play GAMES games, seeded SEED, SEED + 1, ..., across JOBS worker processes
+    (one per CPU by default) and return the merged report.
+
+    See simulate() for the other arguments.
+
+    """
+    assert games >= 1, "Play at least one game"
+    jobs = jobs or os.cpu_count()
+    tasks = [(seed + i, frames, pilot, soa, params) for i in range(games)]
+    start = perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Several games per round trip, yet enough rounds to keep every worker busy.
+        chunksize = max(1, games // (4 * jobs))
+        results = list(executor.map(simulate, tasks, chunksize=chunksize))
+    report = merge(results, perf_counter() - start)
+    report.update({"frames": frames, "pilot": pilot, "seed": seed, "soa": soa, "params": params})
+    return report
+
+
+def print_summary(report, file=sys.stderr):
+    survival = report["survival_ticks"]
+    kills = report["kills"]
+    frame_ms = report["frame_ms"]
+    print(f"{report['games']} games, {report['deaths']} deaths, "
+          f"{report['games_per_sec']:.1f} games/sec, {report['frames_per_sec']:.0f} frames/sec",
+          file=file)
+    print(f"survival: mean {survival['mean']:.0f} ticks, p50 {survival['p50']:.0f}, "
+          f"min {survival['min']:.0f}, max {survival['max']:.0f}", file=file)
+    print(f"kills:    mean {kills['mean']:.1f}, p50 {kills['p50']:.0f}, max {kills['max']:.0f}",
+          file=file)
+    print(f"frame:    mean {frame_ms['mean']:.2f} ms, p50 {frame_ms['p50']:.2f} ms, "
+          f"p99 {frame_ms['p99']:.2f} ms", file=file)
@@ -0,0 +1,47 @@
+
+from spaceinvaders.meta_singleton import MetaSingleton
+
+
+class Clock(metaclass=MetaSingleton):
+    """The simulation clock.
+
+    The simulation advances by fixed TICKs of 1/SIM_HZ second, whatever the rate
+    frames are rendered at: due() tells how many ticks to run to catch up with
+    the wall clock. Under load, at most MAX_TICKS ticks are run per frame and the
+    rest is dropped, so that the game slows down rather than freezes; BEHIND is
+    then set to tell the renderer it may skip the frame.
+
+    Animations, spawns and cooldowns count the sprite manager's ticks, never
+    rendered frames.
+
+    """
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self, sim_hz=30, max_ticks=5):
+        assert sim_hz > 0, "Simulation rate must be greater than 0"
+        self.sim_hz = sim_hz
+        self.dt = 1.0 / sim_hz
+        self.max_ticks = max_ticks
+
+        self.accumulator = 0.0
+        self.last = None
+        self.behind = False
+
+    def due(self, now):
+        """Number of ticks to run at NOW, the wall clock in seconds."""
+        if self.last is None:
+            self.last = now
+            return 1
+
+        self.accumulator += now - self.last
+        self.last = now
+        ticks = int(self.accumulator // self.dt)
+        self.behind = ticks > self.max_ticks
+        if self.behind:
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.dt
+        return ticks
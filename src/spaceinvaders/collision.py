@@ -0,0 +1,72 @@
+
+import numpy as np
+
+
+def boxes(sprites):
+    """Return the (left, top, width, height) arrays of SPRITES' collision boxes."""
+    n = len(sprites)
+    storage = sprites[0].storage
+    if storage is not None and all(s.storage is storage for s in sprites):
+        # Read the structure-of-arrays storage directly.
+        slots = np.fromiter((s.slot for s in sprites), dtype=np.int64, count=n)
+        w = storage.width[slots]
+        h = storage.height[slots]
+        return (storage.x[slots] - w / 2, storage.y[slots] - h / 2, w, h)
+
+    x = np.fromiter((s.left   for s in sprites), dtype=float, count=n)
+    y = np.fromiter((s.top    for s in sprites), dtype=float, count=n)
+    w = np.fromiter((s.width  for s in sprites), dtype=float, count=n)
+    h = np.fromiter((s.height for s in sprites), dtype=float, count=n)
+    return (x, y, w, h)
+
+
+def corners_inside(ax, ay, aw, ah, bx, by, bw, bh):
+    """Tell, for every (a, b) pair of the broadcast arrays, if one of B's corners
+    is inside A.
+
+    A corner is an (x, y) combination of B's left or right side and top or bottom
+    side, so one is inside A if one of B's sides is within A horizontally and one
+    is within A vertically.
+
+    """
+    ar = ax + aw
+    ab = ay + ah
+    br = bx + bw
+    bb = by + bh
+    inside_x = ((ax <= bx) & (bx <= ar)) | ((ax <= br) & (br <= ar))
+    inside_y = ((ay <= by) & (by <= ab)) | ((ay <= bb) & (bb <= ab))
+    return inside_x & inside_y
+
+
+def collide_many(group_a, group_b, grid=None):
+    """Return the (a, b) pairs of colliding sprites from GROUP_A and GROUP_B.
+
+    It's a batched version of a.collide_with(b) or b.collide_with(a): destroyed
+    sprites never collide, and pairs are ordered as if walking GROUP_B for each
+    sprite of GROUP_A.
+
+    Without a GRID, every sprite of GROUP_A is tested against every sprite of
+    GROUP_B. With the SpatialGrid both groups are bucketed in, only the pairs
+    sharing a cell are tested.
+
+    """
+    group_a = [s for s in group_a if not s.destroyed]
+    group_b = [s for s in group_b if not s.destroyed]
+    if not group_a or not group_b:
+        return []
+
+    if grid is not None:
+        pairs = grid.pairs(group_a, group_b)
+        if not pairs:
+            return []
+        a = boxes([a for (a, b) in pairs])
+        b = boxes([b for (a, b) in pairs])
+        hits = corners_inside(*a, *b) | corners_inside(*b, *a)
+        return [pairs[i] for i in np.flatnonzero(hits).tolist()]
+
+    a = boxes(group_a)
+    b = boxes(group_b)
+    (a_rows, b_rows) = ([x[:, None] for x in a], [x[None, :] for x in b])
+    hits = corners_inside(*a_rows, *b_rows) | corners_inside(*b_rows, *a_rows)
+    (ia, ib) = np.nonzero(hits)
+    return [(group_a[i], group_b[j]) for (i, j) in zip(ia.tolist(), ib.tolist())]
@@ -0,0 +1,65 @@
+
+from spaceinvaders.backend import pyxel
+
+# Buttons the game reads, in the order of their bit in the masks.
+BUTTONS = (pyxel.KEY_LEFT, pyxel.KEY_RIGHT, pyxel.KEY_UP, pyxel.KEY_DOWN, pyxel.KEY_RETURN,
+           pyxel.KEY_Q, pyxel.KEY_F1, pyxel.KEY_F2, pyxel.KEY_F3, pyxel.KEY_F4,
+           pyxel.KEY_BACKSPACE)
+
+# Button => its bit:
+BITS = {button: 1 << i for (i, button) in enumerate(BUTTONS)}
+
+
+class Controls:
+    """The buttons held down during the current tick, as a bitmask.
+
+    poll() samples them once per simulation tick, before the mode reads them via
+    btn() and btnp(), in place of pyxel's. Masks come from pyxel, from a replay
+    after play(), or are handed to poll(), e.g., by a harness stepping many worlds.
+    Sampled masks are also handed to the recorder after record().
+
+    """
+
+    def __init__(self):
+        self.held = 0
+        self.previous = 0
+        self.recorder = None
+        self.replay = None
+
+    def record(self, recorder):
+        """Hand every sampled mask to RECORDER, None to stop recording."""
+        if self.recorder is not None:
+            self.recorder.close()
+        self.recorder = recorder
+
+    def play(self, masks):
+        """Take the masks from the MASKS iterable rather than pyxel, None to stop."""
+        self.replay = None if masks is None else iter(masks)
+
+    def sample(self):
+        mask = 0
+        for (button, bit) in BITS.items():
+            if pyxel.btn(button):
+                mask |= bit
+        return mask
+
+    def poll(self, mask=None):
+        """Sample the buttons for the next tick, hold MASK's instead if given."""
+        self.previous = self.held
+        if mask is not None:
+            self.held = mask
+        elif self.replay is None:
+            self.held = self.sample()
+        else:
+            self.held = next(self.replay, 0)
+        if self.recorder is not None:
+            self.recorder.append(self.held)
+
+    def btn(self, button):
+        """Tell if BUTTON is held down."""
+        return self.held & BITS[button] != 0
+
+    def btnp(self, button):
+        """Tell if BUTTON was pressed on this tick."""
+        bit = BITS[button]
+        return self.held & bit != 0 and self.previous & bit == 0
@@ -0,0 +1,269 @@
+
+from math import ceil, floor, inf
+
+import numpy as np
+
+from spaceinvaders.backend import pyxel
+from spaceinvaders.sprite  import Sprite
+
+# Layouts:
+FEATURES = "features"
+GRID     = "grid"
+
+# Sprites the features are about, nearest first, class after class:
+FEATURE_CLASSES = ("Invader", "InvaderProjectile", "RocketProjectile")
+
+# Channels of the grid, one per class:
+GRID_CLASSES = ("Rocket", "Invader", "InvaderProjectile", "RocketProjectile")
+
+
+class Encoder:
+    """Write the state of WORLD, tick after tick, into the same buffer.
+
+    With the FEATURES layout, the buffer is a vector of floats: the rocket's x
+    and y, its hit points and whether its weapon is ready, then, for every class
+    of FEATURE_CLASSES, the K sprites nearest to the rocket, nearest first, as
+    (dx, dy, 1) from the rocket, or (0, 0, 0) when there are fewer. Sprites as
+    near are sorted by dx, then dy, so that both storages give the same vector.
+    Coordinates are in screen widths and heights, hit points from 0 to 1.
+
+    With the GRID layout, it's one channel per class of GRID_CLASSES over the
+    screen cut in CELL x CELL pixels cells: a cell is 1 when a sprite's box
+    covers some of it, 0 otherwise.
+
+    encode() overwrites the buffer, which consumers read through the NumPy array
+    BUFFER or the memoryview VIEW, both over the same memory: no copy is made.
+
+    In the structure-of-arrays mode, all the sprites are encoded at once, from
+    the storage's arrays into scratch arrays allocated once, grown with the
+    storage. Otherwise, the sprite manager's lists of the classes are walked,
+    which is faster as long as there are tens of sprites, not hundreds. The grid
+    is also built by walking the lists in the structure-of-arrays mode, unless
+    more than WALK_LIMIT sprites are on it: the arrays hold every sprite, e.g.,
+    the stars, and cost more than a short walk.
+
+    """
+
+    # Sprites the grid is built from by walking the lists, at most:
+    WALK_LIMIT = 32
+
+    def __init__(self, world, layout=FEATURES, k=8, cell=4):
+        assert layout in (FEATURES, GRID), f"No such layout: {layout}"
+        self.world = world
+        self.layout = layout
+        self.k = k
+        self.cell = cell
+        self.width = pyxel.width
+        self.height = pyxel.height
+        self.classes = FEATURE_CLASSES if layout == FEATURES else GRID_CLASSES
+
+        # Sprite kind => index in self.classes, len(self.classes) for the others.
+        # Kinds of classes defined later on are clipped to the last entry.
+        self.index = np.full(len(Sprite.subclasses) + 2, len(self.classes), dtype=np.intp)
+        for (i, name) in enumerate(self.classes):
+            self.index[Sprite.subclasses[name].kind] = i
+
+        if layout == FEATURES:
+            self.buffer = np.zeros(4 + 3 * k * len(self.classes), dtype=np.float32)
+        else:
+            self.rows = ceil(self.height / cell)
+            self.cols = ceil(self.width / cell)
+            self.buffer = np.zeros((len(self.classes), self.rows, self.cols), dtype=np.uint8)
+        self.view = memoryview(self.buffer)
+
+        self.capacity = 0
+
+    def allocate(self, capacity):
+        """Scratch arrays for CAPACITY slots of the storage."""
+        self.capacity = n = capacity
+        self.group = np.zeros(n, dtype=np.intp)
+        self.mask  = np.zeros(n, dtype=bool)
+        self.f     = np.zeros(n)
+        if self.layout == FEATURES:
+            self.dx   = np.zeros(n)
+            self.dy   = np.zeros(n)
+            self.d2   = np.zeros(n)
+            self.ties = np.zeros(n, dtype=bool)
+            self.g    = np.zeros(n)
+            return
+
+        self.c0     = np.zeros(n, dtype=np.intp)
+        self.c1     = np.zeros(n, dtype=np.intp)
+        self.r0     = np.zeros(n, dtype=np.intp)
+        self.r1     = np.zeros(n, dtype=np.intp)
+        self.base   = np.zeros(n, dtype=np.intp)
+        self.corner = np.zeros(n, dtype=np.intp)
+        # Typed, for ufunc.at() to be ten times faster than with a Python 1.
+        self.ones   = np.ones(n, dtype=np.int32)
+
+        # Sprite boxes are added to a 2D difference array, which prefix sums
+        # turn into counts of sprites per cell. It has an extra row and column,
+        # and an extra channel for the sprites of other classes and empty slots.
+        other = len(self.classes)
+        self.diff = np.zeros((other + 1, self.rows + 1, self.cols + 1), dtype=np.int32)
+        self.sums = np.zeros_like(self.diff)
+        self.flat = self.diff.reshape(-1)
+        self.covered = np.zeros(self.diff.shape, dtype=bool)
+        self.cells = self.covered[:other, :self.rows, :self.cols]
+        self.bits = self.buffer.view(np.bool_)
+
+    def encode(self):
+        """Write the world's current state into the buffer, and return it."""
+        storage = self.world.manager.storage
+        if storage is not None and storage.capacity != self.capacity:
+            self.allocate(storage.capacity)
+        if self.layout == FEATURES:
+            self.encode_rocket()
+            if storage is None:
+                self.encode_features()
+            else:
+                self.encode_features_arrays(storage)
+        elif storage is None or self.count() <= self.WALK_LIMIT:
+            self.encode_grid()
+        else:
+            self.encode_grid_arrays(storage)
+        return self.buffer
+
+    def count(self):
+        """Number of sprites of the encoded classes."""
+        manager = self.world.manager
+        return sum(len(manager.get(name)) for name in self.classes)
+
+    def encode_rocket(self):
+        world = self.world
+        rocket = world.rocket
+        view = self.view
+        view[0] = rocket.x / self.width
+        view[1] = rocket.y / self.height
+        view[2] = world.life_bar.hit_points / world.life_bar.MAX_HIT_POINTS
+        view[3] = rocket.weapon.ready()
+
+    def encode_features(self):
+        rocket = self.world.rocket
+        (rx, ry) = (rocket.x, rocket.y)
+        (width, height) = (self.width, self.height)
+        (view, k) = (self.view, self.k)
+
+        def distance(sprite):
+            (dx, dy) = (sprite.x - rx, sprite.y - ry)
+            return (dx * dx + dy * dy, dx, dy)
+
+        o = 4
+        for name in self.classes:
+            end = o + 3 * k
+            for sprite in sorted(self.world.manager.get(name), key=distance)[:k]:
+                view[o]     = (sprite.x - rx) / width
+                view[o + 1] = (sprite.y - ry) / height
+                view[o + 2] = 1
+                o += 3
+            while o < end:
+                view[o] = 0
+                o += 1
+
+    def encode_features_arrays(self, storage):
+        rocket = self.world.rocket
+        (rx, ry) = (rocket.x, rocket.y)
+        (dx, dy, d2, f, group, mask) = (self.dx, self.dy, self.d2, self.f, self.group, self.mask)
+        np.subtract(storage.x, rx, out=dx)
+        np.subtract(storage.y, ry, out=dy)
+        np.multiply(dx, dx, out=d2)
+        np.multiply(dy, dy, out=f)
+        d2 += f
+        np.take(self.index, storage.kind, out=group, mode="clip")
+
+        (width, height) = (self.width, self.height)
+        (view, k) = (self.view, self.k)
+        for c in range(len(self.classes)):
+            # Squared distances of this class' sprites, infinite for the others.
+            np.equal(group, c, out=mask)
+            mask &= storage.alive
+            f.fill(inf)
+            np.copyto(f, d2, where=mask)
+
+            o = 4 + 3 * k * c
+            end = o + 3 * k
+            while o < end:
+                i = f.argmin()
+                if f[i] == inf:
+                    break
+                if np.count_nonzero(np.equal(f, f[i], out=self.ties)) > 1:
+                    i = self.nearest(i)
+                view[o]     = dx[i] / width
+                view[o + 1] = dy[i] / height
+                view[o + 2] = 1
+                f[i] = inf
+                o += 3
+            while o < end:
+                view[o] = 0
+                o += 1
+
+    def nearest(self, i):
+        """Slot of the sprite with the lowest (dx, dy) among those as near as the
+        one in slot I, i.e., in self.ties."""
+        (g, ties) = (self.g, self.ties)
+        for coordinate in (self.dx, self.dy):
+            g.fill(inf)
+            np.copyto(g, coordinate, where=ties)
+            i = g.argmin()
+            np.equal(g, g[i], out=ties)
+        return i
+
+    def encode_grid(self):
+        buffer = self.buffer
+        buffer.fill(0)
+        (cell, rows, cols) = (self.cell, self.rows, self.cols)
+        for (c, name) in enumerate(self.classes):
+            channel = buffer[c]
+            for sprite in self.world.manager.get(name):
+                (x, y) = (sprite.x, sprite.y)
+                r0 = max(floor((y - sprite.hh) / cell), 0)
+                r1 = min(ceil((y + sprite.hh) / cell), rows)
+                c0 = max(floor((x - sprite.hw) / cell), 0)
+                c1 = min(ceil((x + sprite.hw) / cell), cols)
+                if r0 < r1 and c0 < c1:
+                    channel[r0:r1, c0:c1] = 1
+
+    def encode_grid_arrays(self, storage):
+        (f, cell) = (self.f, self.cell)
+        (c0, c1, r0, r1) = (self.c0, self.c1, self.r0, self.r1)
+
+        # Cells covered by every box, [c0, c1) x [r0, r1), clipped to the screen.
+        for (center, size, lo, hi, n) in [(storage.x, storage.width,  c0, c1, self.cols),
+                                          (storage.y, storage.height, r0, r1, self.rows)]:
+            np.multiply(size, -0.5, out=f)
+            f += center
+            np.floor_divide(f, cell, out=f)
+            np.clip(f, 0, n, out=f)
+            np.copyto(lo, f, casting="unsafe")
+            np.multiply(size, 0.5, out=f)
+            f += center
+            np.divide(f, cell, out=f)
+            np.ceil(f, out=f)
+            np.clip(f, 0, n, out=f)
+            np.copyto(hi, f, casting="unsafe")
+
+        # Sprites of other classes, and empty slots, go to the extra channel.
+        (group, mask, base, corner) = (self.group, self.mask, self.base, self.corner)
+        np.take(self.index, storage.kind, out=group, mode="clip")
+        np.logical_not(storage.alive, out=mask)
+        np.copyto(group, len(self.classes), where=mask)
+        (channels, rows, cols) = self.diff.shape
+        np.multiply(group, rows * cols, out=base)
+
+        # +1 at the top left corner of every box, -1 right of it and below it, +1
+        # diagonally.
+        for (r, c, ufunc) in [(r0, c0, np.add), (r0, c1, np.subtract),
+                              (r1, c0, np.subtract), (r1, c1, np.add)]:
+            np.multiply(r, cols, out=corner)
+            corner += base
+            corner += c
+            ufunc.at(self.flat, corner, self.ones)
+
+        # Neither in place nor over strided views, which would buffer behind the
+        # scenes.
+        diff = self.diff
+        np.cumsum(diff, axis=1, dtype=np.int32, out=self.sums)
+        np.cumsum(self.sums, axis=2, dtype=np.int32, out=diff)
+        np.greater(diff, 0, out=self.covered)
+        np.copyto(self.bits, self.cells)
+        diff.fill(0)
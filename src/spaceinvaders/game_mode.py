@@ -1,44 +1,44 @@
 
 import logging
 
-import pyxel
-
-from spaceinvaders                import LOGGER_NAME
-from spaceinvaders.invader        import Invader
-from spaceinvaders.life_bar       import LifeBar
-from spaceinvaders.rocket         import Rocket
-from spaceinvaders.sprite_manager import SpriteManager
-from spaceinvaders.star           import Star
-from spaceinvaders.ufo            import UFO
+from spaceinvaders                    import LOGGER_NAME
+from spaceinvaders.backend            import pyxel
+from spaceinvaders.profiler           import Profiler
+from spaceinvaders.snapshot           import Rewind
+from spaceinvaders.world              import World
 
 logger = logging.getLogger(LOGGER_NAME)
 
+TRACE_FILENAME = "space-invaders-trace.json"
+
+# The game is snapshotted every REWIND_PERIOD ticks, and the last REWIND_CAPACITY
+# snapshots are kept, i.e., 30 seconds at 30 ticks per second.
+REWIND_PERIOD = 6
+REWIND_CAPACITY = 150
+
 
 class GameMode:
+    """Play a new world, seeded with SEED, flown with CONTROLS. See World for SOA."""
 
-    def __init__(self):
+    def __init__(self, controls, seed=None, soa=None):
         self.paused: bool = False
-
-        manager = SpriteManager().reset()
-        manager.spawn(Invader, 30)
-        manager.spawn(Star,    0.5)
-        manager.attach(Rocket())
-        manager.attach(LifeBar())
-        manager.spawn(UFO, 240)
-        LifeBar().reset()
+        self.rewinding: bool = False
+        self.rewind = Rewind(REWIND_CAPACITY)
+        self.world = World(seed, controls, soa)
 
     def is_game_over(self):
-        return LifeBar().is_dead()
+        return self.world.is_over()
 
     def next_mode(self):
+        controls = self.world.controls
 
-        # Quit the game.
-        if pyxel.btnp(pyxel.KEY_Q):
+        # Quit the game. The next one is seeded differently.
+        if controls.btnp(pyxel.KEY_Q):
             from spaceinvaders.menu_mode import MenuMode
-            return MenuMode()
+            return MenuMode(controls, self.world.seed + 1)
 
         # Toggle debug mode.
-        if pyxel.btnp(pyxel.KEY_F1):
+        if controls.btnp(pyxel.KEY_F1):
             if logger.isEnabledFor(logging.DEBUG):
                 logger.setLevel(logging.INFO)
                 logger.info("Debug Mode: disabled.")
@@ -46,26 +46,60 @@ class GameMode:
                 logger.setLevel(logging.DEBUG)
                 logger.info("Debug Mode: enabled.")
 
+        # Toggle the profiler and its overlay.
+        if controls.btnp(pyxel.KEY_F3):
+            Profiler().toggle()
+            logger.info(f"Profiler: {'enabled' if Profiler().enabled else 'disabled'}.")
+
+        # Export the profiler's trace.
+        if controls.btnp(pyxel.KEY_F4) and Profiler().enabled:
+            Profiler().export(TRACE_FILENAME)
+            logger.info(f"Profiler trace written to {TRACE_FILENAME}.")
+
         # Toggle pause mode.
-        if pyxel.btnp(pyxel.KEY_F2):
+        if controls.btnp(pyxel.KEY_F2):
             self.paused = not self.paused
 
-        if not self.paused:
-            SpriteManager().update()
         return self
 
+    def tick(self):
+        """Advance the simulation by one tick, or go back to the previous snapshot
+        while backspace is held."""
+        if self.paused:
+            return
+
+        world = self.world
+        manager = world.manager
+        self.rewinding = world.controls.btn(pyxel.KEY_BACKSPACE)
+        if self.rewinding:
+            snapshot = self.rewind.pop()
+            if snapshot is not None:
+                manager.restore(snapshot[1])
+            return
+
+        manager.update()
+        tick = world.tick
+        if tick % REWIND_PERIOD == 0:
+            self.rewind.push(tick, manager.snapshot())
+
     def draw_game_over(self):
         if self.is_game_over():
             pyxel.text(pyxel.width / 2 - 15, pyxel.height / 2, "GAME OVER", 7)
 
+    def draw_rewinding(self):
+        if self.rewinding:
+            pyxel.text(1, pyxel.height - 7, "<< REWIND", 7)
+
     def draw_paused(self):
         if self.paused:
-            f = pyxel.frame_count % self.fps
-            if (f // 8) % 2 == 0:
+            if (pyxel.frame_count // 8) % 2 == 0:
                 pyxel.text(1, pyxel.height - 7, "HIT F2 TO RESUME", 7)
 
     def draw(self):
         pyxel.cls(0)
-        SpriteManager().draw()
+        self.world.manager.draw()
         self.draw_game_over()
+        self.draw_rewinding()
         self.draw_paused()
+        if Profiler().enabled:
+            Profiler().draw_overlay()
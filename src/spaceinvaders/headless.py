@@ -0,0 +1,146 @@
+
+import random
+
+import pyxel as _pyxel
+
+
+class Headless:
+    """A pyxel stand-in to run the game without any window.
+
+    It provides the frame count, the screen size and scripted input. Drawing does
+    nothing. Constants such as pyxel.KEY_UP are taken from pyxel itself.
+
+    Input is scripted by SCRIPT, a callable taking the frame count and returning
+    the keys held down during that frame.
+
+    """
+
+    def __init__(self, width=160, height=120, script=None):
+        self.width = width
+        self.height = height
+        self.frame_count = 0
+        self.script = script
+        self.previous = frozenset()
+        self.pressed = self.keys_at(0)
+
+    def __getattr__(self, name):
+        # Only reached for attributes this class doesn't define, e.g., KEY_UP.
+        if name.isupper():
+            return getattr(_pyxel, name)
+        raise AttributeError(f"Headless backend has no '{name}'")
+
+    def keys_at(self, frame):
+        if self.script is None:
+            return frozenset()
+        return frozenset(self.script(frame))
+
+    def step(self):
+        """Move to the next frame, i.e., what pyxel does after each update/draw."""
+        self.frame_count += 1
+        self.previous = self.pressed
+        self.pressed = self.keys_at(self.frame_count)
+
+    # Input:
+
+    def btn(self, key):
+        return key in self.pressed
+
+    def btnp(self, key, hold=None, repeat=None):
+        return key in self.pressed and key not in self.previous
+
+    # Drawing:
+
+    def blt(self, *args, **kwargs):
+        pass
+
+    def cls(self, *args, **kwargs):
+        pass
+
+    def pset(self, *args, **kwargs):
+        pass
+
+    def rect(self, *args, **kwargs):
+        pass
+
+    def rectb(self, *args, **kwargs):
+        pass
+
+    def text(self, *args, **kwargs):
+        pass
+
+    def quit(self):
+        pass
+
+
+def sweep(frame):
+    """Scripted pilot: keep firing while sweeping the screen from side to side."""
+    if (frame // 60) % 2 == 0:
+        return (_pyxel.KEY_UP, _pyxel.KEY_RIGHT)
+    return (_pyxel.KEY_UP, _pyxel.KEY_LEFT)
+
+
+def idle(frame):
+    """Scripted pilot: do nothing."""
+    return ()
+
+
+class RandomPilot:
+    """Scripted pilot: hold a random direction, or none, for a random number of
+    frames, firing most of the time. The same SEED always flies the same way.
+
+    Frames must be asked for in order, as the headless backend does.
+
+    """
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.keys = ()
+        self.until = 0
+
+    def __call__(self, frame):
+        if frame >= self.until:
+            r = self.random
+            move = r.choice((None, _pyxel.KEY_LEFT, _pyxel.KEY_RIGHT))
+            fire = _pyxel.KEY_UP if r.random() < 0.7 else None
+            self.keys = tuple(key for key in (move, fire) if key is not None)
+            self.until = frame + r.randrange(5, 40)
+        return self.keys
+
+
+# Pilot name => function returning the pilot for a given seed:
+PILOTS = {
+    "idle":   lambda seed: idle,
+    "random": RandomPilot,
+    "sweep":  lambda seed: sweep,
+}
+
+
+def run(frames, script=sweep, seed=None, controls=None):
+    """Step a new game FRAMES times, as fast as possible, without any window.
+
+    Every frame runs exactly one simulation tick. The game is seeded with SEED
+    and its buttons sampled by CONTROLS, see GameMode.
+
+    Return the number of frames per second.
+
+    """
+    from time import perf_counter
+
+    from spaceinvaders.backend   import use_headless
+    from spaceinvaders.controls  import Controls
+    from spaceinvaders.game_mode import GameMode
+    from spaceinvaders.startup   import StartupProfiler
+
+    headless = use_headless(script=script)
+    controls = Controls() if controls is None else controls
+    mode = GameMode(controls, seed)
+    start = perf_counter()
+    for frame in range(frames):
+        controls.poll()
+        mode = mode.next_mode()
+        mode.tick()
+        mode.draw()
+        headless.step()
+        if frame == 0:
+            StartupProfiler().first_frame()
+    return frames / (perf_counter() - start)
@@ -2,5 +2,7 @@ from spaceinvaders.vector import Vector
 
 
 class HorizontalSpeed(Vector):
+    __slots__ = ()
+
     def __init__(self, speed):
         super().__init__(speed, 0)
@@ -1,19 +1,26 @@
-from random import randrange
-
 from spaceinvaders.animation import Animation
 from spaceinvaders.sprite    import Sprite
 
 
 class InvaderExplosion(Sprite):
 
-    def __init__(self, invader):
+    __slots__ = ()
+
+    def __init__(self, world, invader):
+        randrange = world.rng.randrange
         animation = Animation(0,                       # img
                               16, 16,                  # width, height
                               0, randrange(3, 7)*16,   # origx, origy
                               10,                      # count
                               loop=False,
                               fps=3)
-        super().__init__(1,                             # depth
+        super().__init__(world,
+                         1,                             # depth
                          invader.pos.copy(),
                          invader.path.copy(),
                          animation)
+
+    def reset(self, invader):
+        self.animation.reset(origy=self.world.rng.randrange(3, 7)*16)
+        self.path.reset(invader.path.table, invader.path.loop)
+        super().reset(invader.pos)
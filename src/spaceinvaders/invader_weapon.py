@@ -1,12 +1,15 @@
 from spaceinvaders.invader_projectile import InvaderProjectile
-from spaceinvaders.weapon import Weapon
+from spaceinvaders.weapon             import Weapon
 
 
 class InvaderWeapon(Weapon):
 
+    # Ticks between two shots of an invader.
+    COOLDOWN = 100
+
     def __init__(self, invader):
-        super().__init__(100)
+        super().__init__(invader.world, self.COOLDOWN)
         self.invader = invader
 
     def projectile(self):
-        return InvaderProjectile(self.invader)
+        return self.world.manager.acquire(InvaderProjectile, self.invader)
@@ -1,36 +1,49 @@
 
-import pyxel
-
 from spaceinvaders.animation      import Animation
-from spaceinvaders.meta_singleton import MetaSingleton
+from spaceinvaders.backend        import pyxel
 from spaceinvaders.path           import Path
 from spaceinvaders.sprite         import Sprite
 from spaceinvaders.vector         import Vector
 from spaceinvaders.vertical_speed import VerticalSpeed
 
 
-class LifeBar(Sprite, metaclass=MetaSingleton):
+class LifeBar(Sprite):
     """Draw rocket's remaining hit points."""
 
-    def __init__(self):
+    __slots__ = ("hit_points",)
+
+    # Hit points of a new rocket: every hit takes 2.
+    MAX_HIT_POINTS = 18
+
+    def __init__(self, world):
         animation = Animation(1,           # img
                               40, 16,      # width, height
                               0, 0,        # origx, origy
                               1)           # count
-        super().__init__(3,                # depth
+        super().__init__(world,
+                         3,                # depth
                          Vector(2 + animation.width / 2, 2 + animation.height / 2),
                          Path([VerticalSpeed(0.0)], loop=True),
                          animation)
         self.reset()
 
+    @classmethod
+    def blank(cls, world):
+        return world.life_bar
+
     def reset(self):
-        self.hit_points = 18
+        self.hit_points = self.MAX_HIT_POINTS
+
+    def state(self):
+        return (self.hit_points,)
+
+    def set_state(self, state):
+        (self.hit_points,) = state
 
     def draw(self):
         Sprite.draw(self)
 
-        (x, y) = self.tlc()
-        (x, y) = (x + 2, y + 2)
+        (x, y) = (self.left + 2, self.top + 2)
         w = self.hit_points
         h = 4
         pyxel.rect(x,     y,     w,     h,     2)
@@ -42,7 +55,7 @@ class LifeBar(Sprite, metaclass=MetaSingleton):
         self.hit_points = max(0, self.hit_points - 2)
 
     def inc(self):
-        self.hit_points = min(18, self.hit_points + 2)
+        self.hit_points = min(self.MAX_HIT_POINTS, self.hit_points + 2)
 
     def die_immediatly(self):
         self.hit_points = 0
@@ -1,37 +1,57 @@
 
 import logging
 
-import pyxel
-
 from spaceinvaders                import LOGGER_NAME
-from spaceinvaders.game_mode      import GameMode
+from spaceinvaders.backend        import pyxel
 from spaceinvaders.quit_mode      import QuitMode
 
 logger = logging.getLogger(LOGGER_NAME)
 
+# Tick at which the game modules are imported, once the menu is on screen.
+PRELOAD_TICK = 2
+
 
 class MenuMode:
+    """The title screen.
+
+    The game modules, i.e., GameMode and every sprite, are only imported once the
+    menu has been drawn, so that it shows up as fast as possible, and before the
+    player picks an entry, so that the game starts right away.
 
-    def __init__(self):
+    The game played next is seeded with SEED, and flown with CONTROLS.
+
+    """
+
+    def __init__(self, controls, seed):
+        self.controls        = controls
+        self.seed            = seed
         self.menu_entry      = 0
         self.last_menu_entry = 1
+        self.ticks           = 0
 
     def next_mode(self):
-        if pyxel.btnp(pyxel.KEY_UP):
+        controls = self.controls
+        if controls.btnp(pyxel.KEY_UP):
             self.menu_entry -= 1
             if self.menu_entry < 0:
                 self.menu_entry = 0
-        elif pyxel.btnp(pyxel.KEY_DOWN):
+        elif controls.btnp(pyxel.KEY_DOWN):
             self.menu_entry += 1
             if self.menu_entry > self.last_menu_entry:
                 self.menu_entry = self.last_menu_entry
-        elif pyxel.btnp(pyxel.KEY_RETURN):
+        elif controls.btnp(pyxel.KEY_RETURN):
             if self.menu_entry == 0:
-                return GameMode()
+                from spaceinvaders.game_mode import GameMode
+                return GameMode(controls, self.seed)
             elif self.menu_entry == 1:
-                return QuitMode()
+                return QuitMode(controls)
         return self
 
+    def tick(self):
+        self.ticks += 1
+        if self.ticks == PRELOAD_TICK:
+            import spaceinvaders.game_mode
+
     def draw(self):
         pyxel.blt(0, 0,                     # (x, y) destination
                   2,                        # numero image source
@@ -1,5 +1,5 @@
 
-from threading import Lock
+from threading import RLock
 
 
 class MetaSingleton(type):
@@ -10,12 +10,13 @@ class MetaSingleton(type):
     _instances
         Dictionary with the keys containing the classes and the values containing the instances of each class.
     _lock
-        Lock used to synchronize threads.
+        Lock used to synchronize threads. It's reentrant so that a singleton can
+        build another one from its constructor.
 
     """
 
     _instances = {}
-    _lock: Lock = Lock()
+    _lock: RLock = RLock()
 
     def __call__(cls, *args, **kwargs):
         """Create one and only one instance of a Class."""
@@ -1,28 +1,131 @@
+import numpy as np
+
+from spaceinvaders        import DEBUG
 from spaceinvaders.vector import Vector
 
 
+class PathTable:
+    """The compiled, immutable moves of a path.
+
+    DELTAS holds the (dx, dy) of each move and PREFIX their prefix sums, i.e.,
+    PREFIX[n] is the displacement after the n first moves. MOVES holds the same
+    moves as (shared) vectors.
+
+    Tables are interned: use compile_moves() or compile_runs() to get one, never
+    build it directly, so that identical paths share one table.
+
+    """
+
+    def __init__(self, key):
+        assert len(key) >= 1, "A path needs at least one move"
+        self.key = key
+        self.moves = tuple(Vector(dx, dy) for (dx, dy) in key)
+
+        self.deltas = np.array(key, dtype=float).reshape(-1, 2)
+        self.prefix = np.zeros((len(key) + 1, 2))
+        np.cumsum(self.deltas, axis=0, out=self.prefix[1:])
+        self.deltas.flags.writeable = False
+        self.prefix.flags.writeable = False
+
+    def __len__(self):
+        return len(self.moves)
+
+    def offset(self, step, loop):
+        """Displacement, as an (x, y) tuple, after the STEP first moves."""
+        n = len(self.moves)
+        if loop:
+            (laps, step) = divmod(step, n)
+        else:
+            (laps, step) = (0, min(step, n))
+        (x, y) = self.prefix[step]
+        (lx, ly) = self.prefix[n]
+        return (float(x + laps * lx), float(y + laps * ly))
+
+
+# Interned tables:
+_tables = {}   # ((dx, dy), ...)         => PathTable
+_runs   = {}   # ((count, dx, dy), ...)  => PathTable
+
+
+def compile_moves(moves):
+    """Interned table for the list of vectors MOVES."""
+    key = tuple((m.x, m.y) for m in moves)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = PathTable(key)
+    return table
+
+
+def compile_runs(runs):
+    """Interned table for RUNS, a list of (count, vector) meaning COUNT times VECTOR."""
+    runs_key = tuple((count, v.x, v.y) for (count, v) in runs)
+    table = _runs.get(runs_key)
+    if table is None:
+        key = ()
+        for (count, dx, dy) in runs_key:
+            key += count * ((dx, dy),)
+        table = _tables.get(key)
+        if table is None:
+            table = _tables[key] = PathTable(key)
+        _runs[runs_key] = table
+    return table
+
+
 class Path:
+    """A walk along the moves of a shared PathTable.
+
+    The only per-path state is CURRENT, the index of the next move.
+
+    """
+
+    __slots__ = ("table", "moves", "current", "loop")
 
     def __init__(self, moves=[], loop=True):
-        self.moves   = moves
+        if isinstance(moves, PathTable):
+            self.table = moves
+        else:
+            self.table = compile_moves(moves)
+        self.moves   = self.table.moves
         self.current = 0
         self.loop    = loop
 
+    @classmethod
+    def runs(cls, runs, loop=True):
+        """Path made of RUNS, a list of (count, vector) meaning COUNT times VECTOR."""
+        return cls(compile_runs(runs), loop=loop)
+
     def next_move(self):
-        assert self.loop or self.current < len(self.moves), "Missing next move"
+        if DEBUG:
+            assert self.loop or self.current < len(self.moves), "Missing next move"
 
         move = self.moves[self.current]
-        assert isinstance(move, Vector)
         self.current += 1
         if self.current == len(self.moves) and self.loop:
             self.current = 0
         return move
 
+    def advance(self, steps):
+        """Skip the STEPS next moves at once and return their sum as a vector."""
+        n = len(self.moves)
+        if not self.loop:
+            steps = min(steps, n - self.current)
+        (x0, y0) = self.table.offset(self.current, self.loop)
+        (x1, y1) = self.table.offset(self.current + steps, self.loop)
+        self.current += steps
+        if self.loop:
+            self.current %= n
+        return Vector(x1 - x0, y1 - y0)
+
     def end(self):
         return not self.loop and self.current == len(self.moves)
 
+    def reset(self, table, loop=True):
+        """Walk TABLE from the start, in place, e.g., for a recycled sprite."""
+        self.table   = table
+        self.moves   = table.moves
+        self.current = 0
+        self.loop    = loop
+
     def copy(self):
-        moves = []
-        for m in self.moves:
-            moves.append(m.copy())
-        return Path(moves, loop=self.loop)
+        """A new walk, from the start, sharing this path's table."""
+        return Path(self.table, loop=self.loop)
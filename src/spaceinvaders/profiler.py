@@ -0,0 +1,98 @@
+
+import csv
+import json
+from collections import deque
+
+from spaceinvaders.backend        import pyxel
+from spaceinvaders.meta_singleton import MetaSingleton
+
+
+class Profiler(metaclass=MetaSingleton):
+    """Per-frame timers around the hot paths of the sprite manager.
+
+    Timers are named after what they measure: "update", "update[DEPTH]",
+    "update.CLASS", "timers", "cull", "collisions", "flush" and "draw". Their per-frame
+    totals are kept over the last WINDOW frames to compute rolling p50/p99, and
+    over the last TRACE_LIMIT frames to be exported as a CSV or JSON trace.
+
+    A frame ends with every update of the sprite manager, i.e., every tick, so
+    that loops which never draw, e.g., headless games, get a frame per tick too.
+    Drawing counts towards the frame of the next tick.
+
+    When not ENABLED, the sprite manager doesn't call the profiler at all.
+
+    """
+
+    def __init__(self, window=120, trace_limit=36000):
+        self.enabled = False
+        self.window = window
+        self.trace_limit = trace_limit
+        self.reset()
+
+    def reset(self):
+        # Name => seconds spent during the current frame.
+        self.current = {}
+
+        # Name => milliseconds spent during each of the last WINDOW frames.
+        self.samples = {}
+
+        # One {name: milliseconds} dictionary per frame.
+        self.trace = deque(maxlen=self.trace_limit)
+        self.frame = 0
+        return self
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        totals = {name: seconds * 1000 for (name, seconds) in self.current.items()}
+        for (name, ms) in totals.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(ms)
+        totals["frame"] = self.frame
+        self.trace.append(totals)
+        self.current = {}
+        self.frame += 1
+
+    def percentiles(self, name):
+        """Rolling (p50, p99) of NAME, in milliseconds."""
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return (0.0, 0.0)
+        n = len(samples)
+        return (samples[(n - 1) // 2], samples[min(n - 1, (n * 99) // 100)])
+
+    def summary(self):
+        return {name: dict(zip(("p50", "p99"), self.percentiles(name))) for name in sorted(self.samples)}
+
+    def export(self, filename):
+        """Write the trace to FILENAME, as CSV if it ends with .csv, as JSON otherwise."""
+        if filename.endswith(".csv"):
+            names = sorted({name for totals in self.trace for name in totals} - {"frame"})
+            with open(filename, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["frame"] + names, restval=0.0)
+                writer.writeheader()
+                writer.writerows(self.trace)
+        else:
+            with open(filename, "w") as f:
+                json.dump({"summary": self.summary(), "frames": list(self.trace)}, f)
+
+    def draw_overlay(self):
+        """Draw the p50/p99 of the main timers, and of the 3 most costly classes."""
+        names = ["update", "timers", "cull", "collisions", "flush", "draw"]
+        classes = [name for name in self.samples if name.startswith("update.")]
+        classes.sort(key=lambda name: self.percentiles(name)[0], reverse=True)
+        names += classes[:3]
+
+        x = pyxel.width - 84
+        pyxel.rect(x - 1, 0, 85, 7 * (len(names) + 1), 0)
+        pyxel.text(x, 1, "TIMER    P50   P99 MS", 7)
+        for (i, name) in enumerate(names):
+            (p50, p99) = self.percentiles(name)
+            pyxel.text(x, 1 + 7 * (i + 1), f"{name[:8]:<8}{p50:5.2f} {p99:5.2f}", 7)
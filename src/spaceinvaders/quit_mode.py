@@ -1,17 +1,16 @@
 
 import logging
 
-import pyxel
-
-from spaceinvaders import LOGGER_NAME
+from spaceinvaders         import LOGGER_NAME
+from spaceinvaders.backend import pyxel
 
 logger = logging.getLogger(LOGGER_NAME)
 
 
 class QuitMode:
 
-    def __init__(self):
-        pass
+    def __init__(self, controls):
+        self.controls = controls
 
     def init(self):
         pass
@@ -19,5 +18,10 @@ class QuitMode:
     def next_mode(self):
         return self
 
+    def tick(self):
+        pass
+
     def draw(self):
+        # pyxel.quit() exits right away: close the log of a recorded session first.
+        self.controls.record(None)
         pyxel.quit()
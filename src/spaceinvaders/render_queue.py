@@ -0,0 +1,95 @@
+
+from spaceinvaders.backend import pyxel
+
+
+class RenderQueue:
+    """Collect the blits of a frame, then issue them in one tight loop.
+
+    Sprites are queued depth by depth. Each visible sprite becomes an (x, y, img,
+    u, v, width, height, colkey) record, i.e., pyxel.blt()'s arguments. Within a
+    depth, records keep the order sprites were queued in, which is how sprites
+    overlap: consecutive records from the same image bank form a run. Sprites
+    drawing themselves form runs of their own, with None for the image bank.
+    Sprites fully offscreen are dropped when queued, those fully hidden behind an
+    opaque sprite at a greater depth when flushed.
+
+    Runs are kept from one frame to the next, so that a steady scene doesn't
+    allocate any list.
+
+    """
+
+    def __init__(self):
+        # Depth => [image bank, blit records or sprites] runs:
+        self.runs = {}
+
+        # Depth => runs used this frame:
+        self.used = {}
+
+        # (depth, left, top, right, bottom) of the opaque sprites:
+        self.opaque = []
+
+    def extend(self, depth, sprites):
+        """Queue the current frame of SPRITES, all at DEPTH."""
+        runs = self.runs.setdefault(depth, [])
+        n = self.used.get(depth, 0)
+        run = runs[n - 1] if n else None
+        width = pyxel.width
+        height = pyxel.height
+        for sprite in sprites:
+            if sprite.batched:
+                x = sprite.left
+                y = sprite.top
+                right = sprite.right
+                bottom = sprite.bottom
+                if right <= 0 or x >= width or bottom <= 0 or y >= height:
+                    continue
+                animation = sprite.animation
+                img = animation.clip.img
+            else:
+                img = None
+
+            if run is None or run[0] != img:
+                if n < len(runs):
+                    run = runs[n]
+                    run[0] = img
+                else:
+                    run = [img, []]
+                    runs.append(run)
+                n += 1
+
+            if img is None:
+                run[1].append(sprite)
+                continue
+            (u, v) = animation.uv()
+            run[1].append((x, y, img, u, v, sprite.width, sprite.height, 0))
+            if sprite.opaque:
+                self.opaque.append((depth, x, y, right, bottom))
+        self.used[depth] = n
+
+    def hidden(self, depth, record):
+        """Tell if RECORD, at DEPTH, is fully covered by an opaque sprite above."""
+        (x, y, img, u, v, w, h, colkey) = record
+        for (d, left, top, right, bottom) in self.opaque:
+            if d > depth and left <= x and x + w <= right and top <= y and y + h <= bottom:
+                return True
+        return False
+
+    def flush(self):
+        """Blit the queued sprites and empty the queue."""
+        blt = pyxel.blt
+        for depth in sorted(self.used):
+            runs = self.runs[depth]
+            for i in range(self.used[depth]):
+                (img, records) = runs[i]
+                if img is None:
+                    for sprite in records:
+                        sprite.draw()
+                    records.clear()
+                    continue
+                if self.opaque:
+                    records = [record for record in records if not self.hidden(depth, record)]
+                for record in records:
+                    blt(*record)
+                runs[i][1].clear()
+        self.used.clear()
+        self.opaque.clear()
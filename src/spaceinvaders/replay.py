@@ -0,0 +1,203 @@
+
+import struct
+from itertools import islice, repeat
+
+# Log header: magic, version, RNG seed, the mode the session starts in.
+MAGIC = b"SIREPLAY"
+VERSION = 1
+HEADER = struct.Struct("<8sHQB")
+
+# Seeds a log can hold:
+SEEDS = range(0, 2 ** 64)
+
+# Modes a session can start in:
+START_MENU = 0
+START_GAME = 1
+
+# Then runs: the buttons mask (see controls.BUTTONS), for that many ticks.
+RUN = struct.Struct("<HI")
+
+
+class Recorder:
+    """Write the masks of a session to a binary log, run-length encoded.
+
+    Runs are written as soon as they end, so that the log survives the game
+    quitting abruptly: only the last run is lost then.
+
+    """
+
+    def __init__(self, filename, seed, start=START_MENU):
+        if seed not in SEEDS:
+            raise ValueError(f"Can't record seed {seed}, out of [0, 2**64)")
+        # Packed first, not to leave an empty log behind if it fails.
+        header = HEADER.pack(MAGIC, VERSION, seed, start)
+        self.file = open(filename, "wb")
+        self.file.write(header)
+        self.mask = None
+        self.count = 0
+
+    def append(self, mask):
+        if mask == self.mask:
+            self.count += 1
+            return
+        self.write_run()
+        self.mask = mask
+        self.count = 1
+
+    def write_run(self):
+        if self.count:
+            self.file.write(RUN.pack(self.mask, self.count))
+            self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.write_run()
+        self.file.close()
+
+
+class Log:
+    """A recorded session: its SEED, START mode and RUNS of (mask, ticks)."""
+
+    def __init__(self, seed, start, runs):
+        self.seed = seed
+        self.start = start
+        self.runs = runs
+
+    @staticmethod
+    def read(filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        (magic, version, seed, start) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} replay log")
+        end = HEADER.size + (len(data) - HEADER.size) // RUN.size * RUN.size
+        runs = list(RUN.iter_unpack(data[HEADER.size:end]))
+        return Log(seed, start, runs)
+
+    def __len__(self):
+        """Number of ticks."""
+        return sum(count for (mask, count) in self.runs)
+
+    def masks(self):
+        for (mask, count) in self.runs:
+            yield from repeat(mask, count)
+
+
+class Player:
+    """Play the session logged in LOG back, tick by tick, without any window.
+
+    Every tick runs the mode's next_mode() and tick(), as the game does, then
+    draw() unless DRAW is False.
+
+    Every PERIOD ticks spent in a game, the player keeps a checkpoint: a snapshot
+    of the game, along with what it doesn't hold, i.e., the game mode's state and
+    the buttons held. seek() then goes to any tick from the closest checkpoint
+    before it rather than from the start of the session. No checkpoint is kept
+    when PERIOD is None.
+
+    """
+
+    def __init__(self, log, draw=True, period=None):
+        from spaceinvaders.backend  import use_headless
+        from spaceinvaders.controls import Controls
+        from spaceinvaders.snapshot import Rewind
+
+        self.log = log
+        self.masks = list(log.masks())
+        self.draw = draw
+        self.period = period
+        self.headless = use_headless()
+        self.controls = Controls()
+
+        self.checkpoints = None
+        if period is not None:
+            self.checkpoints = Rewind(capacity=max(len(log) // period + 1, 15))
+
+        # Checkpoint's tick => (world's seed, paused, buttons held, game mode's
+        # rewind buffer):
+        self.modes = {}
+
+        self.restart()
+
+    def restart(self):
+        """Go back to the start of the session."""
+        self.controls.held = 0
+        self.controls.play(self.masks)
+        if self.log.start == START_GAME:
+            from spaceinvaders.game_mode import GameMode
+            self.mode = GameMode(self.controls, self.log.seed)
+        else:
+            from spaceinvaders.menu_mode import MenuMode
+            self.mode = MenuMode(self.controls, self.log.seed)
+        self.tick = 0
+
+    def step(self):
+        """Play the next tick back."""
+        self.controls.poll()
+        self.mode = self.mode.next_mode()
+        self.mode.tick()
+        if self.draw:
+            self.mode.draw()
+        self.headless.step()
+        self.tick += 1
+
+        if self.period is not None and self.tick % self.period == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        from spaceinvaders.game_mode import GameMode
+
+        mode = self.mode
+        if not isinstance(mode, GameMode):
+            return
+        # Back in time, e.g., after a seek(): the checkpoint exists already.
+        if self.modes and self.tick <= next(reversed(self.modes)):
+            return
+        self.checkpoints.push(self.tick, mode.world.manager.snapshot())
+        self.modes[self.tick] = (mode.world.seed, mode.paused, self.controls.held, mode.rewind.copy())
+
+    def seek(self, tick):
+        """Go to TICK, i.e., right after TICK ticks were played back."""
+        assert 0 <= tick <= len(self.masks), "No such tick"
+        i = None if self.checkpoints is None else self.checkpoints.find(tick)
+        if i is not None:
+            (checkpoint, snapshot) = self.checkpoints.get(i)
+            if tick < self.tick or checkpoint > self.tick:
+                self.resume(checkpoint, snapshot)
+        elif tick < self.tick:
+            self.restart()
+        while self.tick < tick:
+            self.step()
+
+    def resume(self, tick, snapshot):
+        """Go to the checkpoint taken at TICK."""
+        from spaceinvaders.game_mode import GameMode
+
+        (seed, paused, held, rewind) = self.modes[tick]
+        self.mode = GameMode(self.controls, seed)
+        self.mode.world.manager.restore(snapshot)
+        self.mode.paused = paused
+        self.mode.rewind = rewind.copy()
+        self.controls.held = held
+        self.controls.play(islice(self.masks, tick, None))
+        self.tick = tick
+
+    def close(self):
+        self.controls.play(None)
+
+
+def run(filename, draw=True):
+    """Replay the session logged in FILENAME, as fast as possible, without any window.
+
+    Return the number of ticks and ticks per second.
+
+    """
+    from time import perf_counter
+
+    player = Player(Log.read(filename), draw=draw)
+    ticks = len(player.masks)
+    start = perf_counter()
+    player.seek(ticks)
+    player.close()
+    return (ticks, ticks / (perf_counter() - start))
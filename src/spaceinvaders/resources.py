@@ -0,0 +1,122 @@
+
+import ctypes
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from importlib import resources
+from pathlib import Path
+
+from spaceinvaders         import LOGGER_NAME
+from spaceinvaders.backend import pyxel
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# The resource bundle, shipped within the package:
+BUNDLE = "space-invaders.pyxres"
+
+# Bump whenever the cache layout changes.
+CACHE_VERSION = 1
+
+# Cache header: magic, version, SHA-256 of the bundle, number of banks, then
+# each bank's width and height. Pixels follow, bank after bank, one byte each.
+MAGIC = b"SIBANKS\0"
+HEADER = struct.Struct("<8sI32sI")
+BANK = struct.Struct("<II")
+
+
+def bundle():
+    """The packaged resource bundle, as an importlib.resources Traversable."""
+    return resources.files("spaceinvaders") / "graphics" / BUNDLE
+
+
+def cache_dir():
+    """Where this user's caches go, following the platform's conventions."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "space-invaders"
+
+
+def cache_file():
+    return cache_dir() / f"images-v{CACHE_VERSION}.bin"
+
+
+def load_images():
+    """Load the image banks of the bundle into pyxel.
+
+    The first run decodes them from the bundle with pyxel.load() and dumps their
+    raw pixels into a cache file. Later runs memory-map the cache and copy the
+    pixels straight into the banks. The cache is rebuilt whenever the bundle's
+    content changes.
+
+    """
+    digest = hashlib.sha256(bundle().read_bytes()).digest()
+    cache = cache_file()
+    if read_cache(cache, digest):
+        return
+
+    with resources.as_file(bundle()) as path:
+        pyxel.load(str(path), exclude_tilemaps=True, exclude_sounds=True, exclude_musics=True)
+    try:
+        write_cache(cache, digest, pyxel.images)
+    except OSError as e:
+        logger.warning(f"Can't cache the image banks in {cache}: {e}")
+
+
+def write_cache(filename, digest, images):
+    """Dump the raw pixels of IMAGES into FILENAME, for the bundle hashed as DIGEST."""
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp = filename.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, CACHE_VERSION, digest, len(images)))
+        for image in images:
+            f.write(BANK.pack(image.width, image.height))
+        for image in images:
+            f.write(bytes(image.data_ptr()))
+    # Readers never see a partial cache.
+    os.replace(tmp, filename)
+
+
+def read_cache(filename, digest, images=None):
+    """Copy the pixels cached in FILENAME into IMAGES, pyxel's banks by default.
+
+    Return False, leaving IMAGES untouched, if the cache is missing, stale, i.e.,
+    not made from the bundle hashed as DIGEST, or doesn't fit IMAGES.
+
+    """
+    if images is None:
+        images = pyxel.images
+    try:
+        with open(filename, "rb") as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):  # ValueError: empty file.
+        return False
+
+    with m:
+        if len(m) < HEADER.size:
+            return False
+        (magic, version, cached_digest, count) = HEADER.unpack_from(m)
+        if magic != MAGIC or version != CACHE_VERSION or cached_digest != digest \
+           or count != len(images):
+            return False
+
+        sizes = [BANK.unpack_from(m, HEADER.size + i * BANK.size) for i in range(count)]
+        offset = HEADER.size + count * BANK.size
+        if len(m) != offset + sum(w * h for (w, h) in sizes):
+            return False
+        if any((image.width, image.height) != size for (image, size) in zip(images, sizes)):
+            return False
+
+        for (image, (w, h)) in zip(images, sizes):
+            pixels = (ctypes.c_ubyte * (w * h)).from_buffer(m, offset)
+            ctypes.memmove(image.data_ptr(), pixels, w * h)
+            # The map can't be closed while a view on it exists.
+            del pixels
+            offset += w * h
+    return True
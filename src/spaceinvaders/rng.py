@@ -0,0 +1,30 @@
+
+import os
+import random
+
+
+def random_seed():
+    """A seed picked at random, for a game nobody asked to seed."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+class RNG:
+    """A world's only source of randomness.
+
+    It's seeded, with SEED, so that a game replayed from the same seed and the
+    same input is the very same game. Sprites use self.world.rng.randrange(),
+    never the random module.
+
+    """
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Restart the sequence from SEED, a random one if None."""
+        if seed is None:
+            seed = random_seed()
+        self.seed_value = seed
+        self.random = random.Random(seed)
+        self.randrange = self.random.randrange
+        return self
@@ -1,21 +1,23 @@
 
-import pyxel
-
 from spaceinvaders.animation         import Animation
+from spaceinvaders.backend           import pyxel
 from spaceinvaders.invader_explosion import InvaderExplosion
-from spaceinvaders.life_bar          import LifeBar
-from spaceinvaders.meta_singleton    import MetaSingleton
 from spaceinvaders.path              import Path
 from spaceinvaders.rocket_weapon     import RocketWeapon
 from spaceinvaders.sprite            import Sprite
-from spaceinvaders.sprite_manager    import SpriteManager
 from spaceinvaders.vector            import Vector
 from spaceinvaders.vertical_speed    import VerticalSpeed
 
 
-class Rocket(Sprite, metaclass=MetaSingleton):
+class Rocket(Sprite):
+    """The player's rocket, flown with the WORLD's controls."""
+
+    __slots__ = ("normal_speed", "left_speed", "right_speed", "rocket_speed", "weapon", "kills")
+
+    # Ticks between two shots.
+    COOLDOWN = 10
 
-    def __init__(self):
+    def __init__(self, world):
         self.normal_speed = Animation(0,         # img
                                       16, 16,    # width, height
                                       0, 0,      # origx, origy
@@ -28,44 +30,71 @@ class Rocket(Sprite, metaclass=MetaSingleton):
                                       16, 16,    # width, height
                                       0, 32,     # origx, origy
                                       4)         # count
-        super().__init__(2,                                                 # depth
-                         Vector((pyxel.width / 2) - 8, pyxel.height - 16),
+        super().__init__(world,
+                         2,                                                 # depth
+                         self.start_pos(),
                          Path([VerticalSpeed(0.0)], loop=True),
                          self.normal_speed)
         self.rocket_speed = 1.5
 
-        self.weapon = RocketWeapon(10)
+        self.weapon = RocketWeapon(world, self.COOLDOWN)
+
+        # Invaders shot down since the world started.
+        self.kills = 0
+
+    def start_pos(self):
+        return Vector((pyxel.width / 2) - 8, pyxel.height - 16)
+
+    @classmethod
+    def blank(cls, world):
+        return world.rocket
+
+    def animations(self):
+        return (self.normal_speed, self.left_speed, self.right_speed)
+
+    def state(self):
+        animations = self.animations()
+        return (self.weapon.ready_tick, self.kills, animations.index(self.animation),
+                *(animation.start - animation.now() for animation in animations))
+
+    def set_state(self, state):
+        (self.weapon.ready_tick, self.kills, playing, *starts) = state
+        for (animation, start) in zip(self.animations(), starts):
+            animation.unbind()
+            animation.start = start
+        self.animation = self.animations()[playing]
 
     def update(self):
-        if pyxel.btn(pyxel.KEY_LEFT):
-            self.left()
-        elif pyxel.btn(pyxel.KEY_RIGHT):
-            self.right()
+        controls = self.world.controls
+        if controls.btn(pyxel.KEY_LEFT):
+            self.move_left()
+        elif controls.btn(pyxel.KEY_RIGHT):
+            self.move_right()
         else:
-            self.animation = self.normal_speed
+            self.play(self.normal_speed)
 
-        if pyxel.btn(pyxel.KEY_UP):
+        if controls.btn(pyxel.KEY_UP):
             self.shoot()
 
-        self.weapon.update()
-
         Sprite.update(self)
 
-    def left(self):
-        if self.x - self.width/2 - self.rocket_speed >= 0:
+    def move_left(self):
+        if self.left - self.rocket_speed >= 0:
             self.teleport( Vector(-self.rocket_speed, 0) )
-            self.animation = self.left_speed
+            self.play(self.left_speed)
 
-    def right(self):
-        if self.x + self.width/2 + self.rocket_speed <= pyxel.width:
+    def move_right(self):
+        if self.right + self.rocket_speed <= pyxel.width:
             self.teleport( Vector(self.rocket_speed, 0) )
-            self.animation = self.right_speed
+            self.play(self.right_speed)
 
     def shoot(self):
         self.weapon.fire()
 
     def hit_by(self, sprite):
-        LifeBar().dec()
-        if LifeBar().is_dead():
+        life_bar = self.world.life_bar
+        life_bar.dec()
+        if life_bar.is_dead() and not self.destroyed:
             self.destroy()
-            SpriteManager().attach(InvaderExplosion(self))
+            manager = self.world.manager
+            manager.attach(manager.acquire(InvaderExplosion, self))
@@ -1,12 +1,13 @@
 from spaceinvaders.animation import Animation
-from spaceinvaders.rocket import Rocket
 from spaceinvaders.sprite import Sprite
 
 
 class RocketExplosion(Sprite):
 
-    def __init__(self):
-        rocket = Rocket()
+    __slots__ = ()
+
+    def __init__(self, world):
+        rocket = world.rocket
         animation = Animation(1,                       # img
                               16, 16,                  # width, height
                               0, 40,                   # origx, origy
@@ -14,7 +15,8 @@ class RocketExplosion(Sprite):
                               loop=False,
                               fps=10)
         Sprite.__init__(self,
+                        world,
                         1,                             # depth
-                        Rocket().pos.copy(),
-                        Rocket().path.copy(),
+                        rocket.pos.copy(),
+                        rocket.path.copy(),
                         animation)
@@ -1,29 +1,65 @@
 
 import logging
-
-import pyxel
+from time import perf_counter
 
 from spaceinvaders                import LOGGER_NAME
+from spaceinvaders.backend        import pyxel
+from spaceinvaders.clock          import Clock
+from spaceinvaders.controls       import Controls
 from spaceinvaders.menu_mode      import MenuMode
 from spaceinvaders.meta_singleton import MetaSingleton
+from spaceinvaders.resources      import load_images
+from spaceinvaders.rng            import random_seed
+from spaceinvaders.startup        import StartupProfiler
 
 logger = logging.getLogger(LOGGER_NAME)
 
 
 class Root(metaclass=MetaSingleton):
+    """Run the game modes in a pyxel window.
+
+    Frames are rendered at RENDER_HZ while the simulation advances at SIM_HZ:
+    every frame runs as many simulation ticks as due. Each tick samples the
+    buttons, lets the mode handle them, then advances the mode. Rendering is
+    skipped when the simulation falls behind.
+
+    Buttons are sampled by CONTROLS, new ones by default. The first game is
+    seeded with SEED, a random one if None.
+
+    Only what the menu needs is loaded before it shows up: the game modules are
+    imported later on, and only the image banks are loaded, from their cache when
+    possible.
+
+    """
 
-    def __init__(self):
-        self.fps: int =  30
-        self.mode = MenuMode()
+    def __init__(self, sim_hz=30, render_hz=30, controls=None, seed=None):
+        self.fps: int = render_hz
+        self.controls = Controls() if controls is None else controls
+        self.mode = MenuMode(self.controls, random_seed() if seed is None else seed)
+        self.first_frame = True
+        Clock().configure(sim_hz)
 
+        startup = StartupProfiler()
         pyxel.init(160, 120, fps=self.fps)
-        pyxel.load("graphics/space-invaders.pyxres")
+        startup.mark("pyxel.init")
+        load_images()
+        startup.mark("images")
 
     def run(self):
         pyxel.run(self.update, self.draw)
 
     def update(self):
-        self.mode = self.mode.next_mode()
+        clock = Clock()
+        controls = self.controls
+        for i in range(clock.due(perf_counter())):
+            controls.poll()
+            self.mode = self.mode.next_mode()
+            self.mode.tick()
 
     def draw(self):
+        if Clock().behind:
+            return
         self.mode.draw()
+        if self.first_frame:
+            self.first_frame = False
+            StartupProfiler().first_frame()
@@ -0,0 +1,74 @@
+
+from heapq import heappop, heappush
+
+
+class Timer:
+    """A callback the scheduler runs at tick DUE, then every PERIOD ticks if set."""
+
+    __slots__ = ("due", "period", "callback", "cancelled")
+
+    def __init__(self, due, period, callback):
+        self.due = due
+        self.period = period
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Run callbacks at given ticks.
+
+    Timers are kept in a heap ordered by due tick, so that a tick only costs as
+    much as the number of timers due, not as the number of timers. Cancelled
+    timers are dropped when they reach the top of the heap.
+
+    TICK is the current tick: run() the timers due, then advance() to the next.
+
+    """
+
+    def __init__(self, tick=0):
+        self.tick = tick
+        self.heap = []
+
+        # Tie-breaker keeping timers due at the same tick in scheduling order.
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def at(self, tick, callback, period=None):
+        """Run CALLBACK at TICK, then every PERIOD ticks if set."""
+        assert period is None or period >= 1, "Period must be at least 1 tick"
+        timer = Timer(tick, period, callback)
+        self.push(timer)
+        return timer
+
+    def every(self, period, callback):
+        """Run CALLBACK every PERIOD ticks, on the ticks that are multiples of PERIOD."""
+        return self.at(self.next_multiple(period), callback, period)
+
+    def next_multiple(self, period):
+        """First tick after the current one which is a multiple of PERIOD."""
+        return (self.tick // period + 1) * period
+
+    def push(self, timer):
+        heappush(self.heap, (timer.due, self.seq, timer))
+        self.seq += 1
+
+    def advance(self):
+        self.tick += 1
+
+    def run(self):
+        """Run the timers due at the current tick, or before."""
+        tick = self.tick
+        heap = self.heap
+        while heap and heap[0][0] <= tick:
+            timer = heappop(heap)[2]
+            if timer.cancelled:
+                continue
+            timer.callback()
+            if timer.period is not None and not timer.cancelled:
+                timer.due += timer.period
+                self.push(timer)
@@ -0,0 +1,288 @@
+
+import math
+import struct
+import zlib
+from collections import deque
+from itertools import groupby, islice
+
+from spaceinvaders.animation import Animation
+from spaceinvaders.path      import Path, compile_runs
+from spaceinvaders.sprite    import Sprite
+from spaceinvaders.vector    import Vector
+
+# A snapshot is the whole state of a world, i.e., of its sprite manager, between
+# two ticks. It holds, little-endian:
+#
+# - HEADER: magic, version, the scheduler's tick and sequence number, then the
+#   number of classes, clips, paths, spawners, and sprites at each depth,
+# - the state of the world's RNG,
+# - dictionaries, which the sprites refer to by index:
+#   - class names: length, then UTF-8 name,
+#   - clips: their compile_clip() key,
+#   - paths: loop flag and number of runs, then (count, dx, dy) runs,
+# - spawners, in order: sprites spawned so far and timer's sequence number,
+# - sprites, depth after depth, in update order: class, clip, path, center,
+#   path's current move, animation start, and the length of their state(),
+# - then the states of every sprite, one after the other.
+#
+# Only the spawn timers are part of the scheduler's state.
+MAGIC = b"SISNAPSH"
+VERSION = 1
+HEADER = struct.Struct("<8sHqqHHHH4II")
+RNG_STATE = struct.Struct("<625Id")
+NAME = struct.Struct("<B")
+CLIP = struct.Struct("<BHHhhHBBH")
+PATH = struct.Struct("<BH")
+RUN = struct.Struct("<Idd")
+SPAWNER = struct.Struct("<qq")
+SPRITE = struct.Struct("<HHHddIqB")
+STATE = "q"
+
+# PathTable => runs, as a tuple of (count, dx, dy):
+_runs = {}
+
+
+def runs(table):
+    """TABLE's moves, run-length encoded."""
+    r = _runs.get(table)
+    if r is None:
+        r = _runs[table] = tuple((len(list(group)), dx, dy) for ((dx, dy), group) in groupby(table.key))
+    return r
+
+
+class Index(dict):
+    """Number distinct keys in the order they're first seen."""
+
+    def id(self, key):
+        i = self.get(key)
+        if i is None:
+            i = self[key] = len(self)
+        return i
+
+
+def dump(manager):
+    """Snapshot of MANAGER's game, as bytes."""
+    assert not manager.updating, "Can't snapshot while updating"
+    scheduler = manager.scheduler
+    names = Index()
+    clips = Index()
+    paths = Index()
+
+    sprites = []
+    states = []
+    storage = manager.storage
+    for plan in manager.plans:
+        if storage is None:
+            positions = ((s._pos.x, s._pos.y, s.path.current) for s in plan)
+        else:
+            # Read the storage in one go rather than sprite by sprite.
+            slots = [s.slot for s in plan]
+            positions = zip(storage.x[slots].tolist(), storage.y[slots].tolist(),
+                            storage.current[slots].tolist())
+        for (sprite, (x, y, current)) in zip(plan, positions):
+            path = sprite.path
+            animation = sprite.animation
+            state = sprite.state()
+            sprites.append(SPRITE.pack(names.id(type(sprite)),
+                                       clips.id(animation.clip),
+                                       paths.id((path.table, path.loop)),
+                                       x, y, current,
+                                       animation.start - animation.now(),
+                                       len(state)))
+            states.extend(state)
+
+    seqs = {id(timer): seq for (due, seq, timer) in scheduler.heap}
+    (version, mt, gauss) = manager.world.rng.random.getstate()
+
+    chunks = [HEADER.pack(MAGIC, VERSION, scheduler.tick, scheduler.seq,
+                          len(names), len(clips), len(paths), len(manager.spawners),
+                          *(len(plan) for plan in manager.plans), len(states)),
+              RNG_STATE.pack(*mt, math.nan if gauss is None else gauss)]
+    for cls in names:
+        encoded = cls.__name__.encode()
+        chunks.append(NAME.pack(len(encoded)) + encoded)
+    chunks.extend(CLIP.pack(*clip.key) for clip in clips)
+    for (table, loop) in paths:
+        r = runs(table)
+        chunks.append(PATH.pack(loop, len(r)))
+        chunks.extend(RUN.pack(*run) for run in r)
+    chunks.extend(SPAWNER.pack(spawner.count, seqs[id(spawner.timer)]) for spawner in manager.spawners)
+    chunks.extend(sprites)
+    chunks.append(struct.pack(f"<{len(states)}{STATE}", *states))
+    return b"".join(chunks)
+
+
+def load(manager, data):
+    """Bring MANAGER's game back to the snapshot DATA.
+
+    The manager must run the same game, i.e., with the same spawners, as when
+    the snapshot was taken. Its current sprites are dropped, and new ones are
+    built from the snapshot, but for those the world owns, e.g., the rocket.
+
+    """
+    assert not manager.updating, "Can't restore while updating"
+    (magic, version, tick, seq, n_names, n_clips, n_paths, n_spawners, *depths, n_states) = \
+        HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} snapshot")
+    if n_spawners != len(manager.spawners):
+        raise ValueError(f"Snapshot of a game with {n_spawners} spawners, not {len(manager.spawners)}")
+    offset = HEADER.size
+
+    (*mt, gauss) = RNG_STATE.unpack_from(data, offset)
+    offset += RNG_STATE.size
+    world = manager.world
+    world.rng.random.setstate((3, tuple(mt), None if math.isnan(gauss) else gauss))
+
+    classes = []
+    for i in range(n_names):
+        (length,) = NAME.unpack_from(data, offset)
+        offset += NAME.size
+        classes.append(Sprite.subclasses[data[offset:offset + length].decode()])
+        offset += length
+
+    clips = [(img, width, height, origx, origy, count, bool(loop), direction, fps)
+             for (img, width, height, origx, origy, count, loop, direction, fps)
+             in CLIP.iter_unpack(data[offset:offset + n_clips * CLIP.size])]
+    offset += n_clips * CLIP.size
+
+    paths = []
+    for i in range(n_paths):
+        (loop, n_runs) = PATH.unpack_from(data, offset)
+        offset += PATH.size
+        r = [(count, Vector(dx, dy)) for (count, dx, dy)
+             in RUN.iter_unpack(data[offset:offset + n_runs * RUN.size])]
+        offset += n_runs * RUN.size
+        paths.append((compile_runs(r), bool(loop)))
+
+    manager.clear()
+    scheduler = manager.scheduler
+    scheduler.tick = tick
+    scheduler.seq = seq
+    scheduler.heap = []
+    for spawner in manager.spawners:
+        (count, timer_seq) = SPAWNER.unpack_from(data, offset)
+        offset += SPAWNER.size
+        spawner.restore(count, timer_seq)
+
+    records = SPRITE.iter_unpack(data[offset:offset + sum(depths) * SPRITE.size])
+    offset += sum(depths) * SPRITE.size
+    states = struct.unpack_from(f"<{n_states}{STATE}", data, offset)
+
+    sprites = []
+    s = 0
+    for (depth, n) in enumerate(depths):
+        for (cls, clip, path, x, y, current, start, n_state) in islice(records, n):
+            animation = Animation(*clips[clip])
+            animation.start = start
+            (table, loop) = paths[path]
+            p = Path(table, loop=loop)
+            p.current = current
+
+            sprite = classes[cls].blank(world)
+            Sprite.__init__(sprite, world, depth, Vector(x, y), p, animation)
+            sprite.set_state(states[s:s + n_state])
+            s += n_state
+            sprites.append(sprite)
+    manager.attach_many(sprites)
+
+
+class Rewind:
+    """Keep the snapshots of the last ticks, to go back in time.
+
+    Up to CAPACITY snapshots are kept, oldest dropped first. Most are stored as
+    deltas: compressed with the previous snapshot as a preset dictionary, i.e.,
+    only what changed since takes room. Every KEYFRAME snapshots, one is stored on
+    its own so that getting one back never decodes more than KEYFRAME snapshots.
+
+    """
+
+    def __init__(self, capacity=300, keyframe=15):
+        assert capacity >= keyframe >= 1, "Capacity must hold at least one keyframe"
+        self.capacity = capacity
+        self.keyframe = keyframe
+
+        # (tick, is keyframe, compressed snapshot), oldest first:
+        self.entries = deque()
+
+        # The newest snapshot, uncompressed, the base of the next delta. None
+        # when the next one is a keyframe.
+        self.last = None
+        self.since_keyframe = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def copy(self):
+        """A copy sharing the snapshots, which are never modified."""
+        other = Rewind(self.capacity, self.keyframe)
+        other.entries = self.entries.copy()
+        other.last = self.last
+        other.since_keyframe = self.since_keyframe
+        return other
+
+    def ticks(self):
+        return [tick for (tick, keyframe, data) in self.entries]
+
+    def nbytes(self):
+        """Memory taken by the compressed snapshots."""
+        return sum(len(data) for (tick, keyframe, data) in self.entries)
+
+    def push(self, tick, snapshot):
+        """Keep SNAPSHOT, taken at TICK."""
+        if self.last is None or self.since_keyframe == self.keyframe:
+            self.entries.append((tick, True, zlib.compress(snapshot, 1)))
+            self.since_keyframe = 1
+        else:
+            compressor = zlib.compressobj(1, zdict=self.last)
+            self.entries.append((tick, False, compressor.compress(snapshot) + compressor.flush()))
+            self.since_keyframe += 1
+        self.last = snapshot
+
+        # Drop whole keyframe groups: a delta is useless without its keyframe.
+        if len(self.entries) > self.capacity:
+            self.entries.popleft()
+            while self.entries and not self.entries[0][1]:
+                self.entries.popleft()
+
+    def get(self, i):
+        """The I-th snapshot, oldest first, as (tick, snapshot). I may be negative."""
+        if i < 0:
+            i += len(self.entries)
+        if not 0 <= i < len(self.entries):
+            raise IndexError("No such snapshot")
+        k = i
+        while not self.entries[k][1]:
+            k -= 1
+        snapshot = None
+        for j in range(k, i + 1):
+            (tick, keyframe, data) = self.entries[j]
+            if keyframe:
+                snapshot = zlib.decompress(data)
+            else:
+                snapshot = zlib.decompressobj(zdict=snapshot).decompress(data)
+        return (tick, snapshot)
+
+    def find(self, tick):
+        """Index of the newest snapshot taken at TICK or before, None if none."""
+        found = None
+        for (i, (t, keyframe, data)) in enumerate(self.entries):
+            if t > tick:
+                break
+            found = i
+        return found
+
+    def pop(self):
+        """Remove the newest snapshot and return it as (tick, snapshot), None if empty."""
+        if not self.entries:
+            return None
+        entry = self.get(-1)
+        self.truncate(len(self.entries) - 1)
+        return entry
+
+    def truncate(self, n):
+        """Keep the N oldest snapshots only, e.g., once the game went back in time."""
+        while len(self.entries) > n:
+            self.entries.pop()
+        # The next one is a keyframe, so as not to decode the newest one again.
+        self.last = None
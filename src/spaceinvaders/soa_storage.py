@@ -0,0 +1,204 @@
+
+import numpy as np
+
+
+class SoAStorage:
+    """Structure-of-arrays storage for the position and motion of attached sprites.
+
+    Each sprite owns a SLOT, i.e., an index into NumPy arrays holding its center,
+    its size, its class' KIND and where it is on its path. The moves of every
+    path are packed in one MOVES table; a sprite only remembers the OFFSET and
+    LENGTH of its own moves in it. step() then moves all the sprites of a depth
+    at once.
+
+    Sprites living in the storage are thin views over it: their x, y and pos
+    attributes read the arrays.
+
+    """
+
+    def __init__(self, capacity=256, cell=16):
+        self.capacity = 0
+        self.cell = cell
+
+        # Slot => sprite, None for free slots.
+        self.sprites = []
+        self.free = []
+
+        self.x       = np.zeros(0)
+        self.y       = np.zeros(0)
+        self.width   = np.zeros(0)
+        self.height  = np.zeros(0)
+        self.margin  = np.zeros((0, 2))
+        self.depth   = np.zeros(0, dtype=np.int8)
+        self.kind    = np.zeros(0, dtype=np.int16)
+        self.alive   = np.zeros(0, dtype=bool)
+        self.current = np.zeros(0, dtype=np.int64)
+        self.offset  = np.zeros(0, dtype=np.int64)
+        self.length  = np.zeros(0, dtype=np.int64)
+        self.loop    = np.zeros(0, dtype=bool)
+
+        # Grid cells range of each slot, to tell which sprites crossed a cell.
+        self.cells = np.zeros((0, 4), dtype=np.int64)
+
+        # Packed moves of every known path table:
+        self.moves = np.zeros((0, 2))
+        self.tables = {}   # PathTable => offset in self.moves
+
+        # Depth => slots of the live sprites at this depth (None when stale).
+        self.depth_slots = {}
+
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        n = capacity - self.capacity
+        assert n > 0, "Storage can only grow"
+        for name in ["x", "y", "width", "height", "margin", "depth", "kind", "alive",
+                     "current", "offset", "length", "loop", "cells"]:
+            array = getattr(self, name)
+            extra = np.zeros((n,) + array.shape[1:], dtype=array.dtype)
+            setattr(self, name, np.concatenate([array, extra]))
+        self.sprites.extend([None] * n)
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def table(self, path):
+        """Offset of PATH's moves in the packed table, adding them if needed."""
+        offset = self.tables.get(path.table)
+        if offset is None:
+            offset = len(self.moves)
+            self.moves = np.concatenate([self.moves, path.table.deltas])
+            self.tables[path.table] = offset
+        return offset
+
+    def add(self, sprite):
+        if not self.free:
+            self.grow(2 * self.capacity)
+        slot = self.free.pop()
+
+        pos = sprite.pos
+        self.x[slot]       = pos.x
+        self.y[slot]       = pos.y
+        self.width[slot]   = sprite.width
+        self.height[slot]  = sprite.height
+        self.margin[slot]  = sprite.margin
+        self.depth[slot]   = sprite.depth
+        self.kind[slot]    = sprite.kind
+        self.alive[slot]   = True
+        self.current[slot] = sprite.path.current
+        self.offset[slot]  = self.table(sprite.path)
+        self.length[slot]  = len(sprite.path.moves)
+        self.loop[slot]    = sprite.path.loop
+        self.cells[slot]   = self.cells_range(slot)
+
+        self.sprites[slot] = sprite
+        self.depth_slots[sprite.depth] = None
+        sprite.storage = self
+        sprite.slot = slot
+
+    def add_many(self, sprites):
+        """Same as add() for every sprite of SPRITES, with one write per array."""
+        if not sprites:
+            return
+        while len(self.free) < len(sprites):
+            self.grow(2 * self.capacity)
+        slots = [self.free.pop() for sprite in sprites]
+
+        self.x[slots]       = [s.pos.x for s in sprites]
+        self.y[slots]       = [s.pos.y for s in sprites]
+        self.width[slots]   = [s.width for s in sprites]
+        self.height[slots]  = [s.height for s in sprites]
+        self.margin[slots]  = [s.margin for s in sprites]
+        self.depth[slots]   = [s.depth for s in sprites]
+        self.kind[slots]    = [s.kind for s in sprites]
+        self.alive[slots]   = True
+        self.current[slots] = [s.path.current for s in sprites]
+        self.offset[slots]  = [self.table(s.path) for s in sprites]
+        self.length[slots]  = [len(s.path.moves) for s in sprites]
+        self.loop[slots]    = [s.path.loop for s in sprites]
+        self.cells[slots]   = self.cells_range(slots)
+
+        for (slot, sprite) in zip(slots, sprites):
+            self.sprites[slot] = sprite
+            sprite.storage = self
+            sprite.slot = slot
+        self.depth_slots.clear()
+
+    def remove(self, sprite):
+        """Hand SPRITE its position and path state back and free its slot."""
+        slot = sprite.slot
+        sprite.storage = None
+        sprite.slot = None
+        sprite._pos.x = self.x[slot].item()
+        sprite._pos.y = self.y[slot].item()
+        sprite.update_bounds()
+        sprite.path.current = self.current[slot].item()
+
+        self.alive[slot] = False
+        self.sprites[slot] = None
+        self.free.append(slot)
+        self.depth_slots[sprite.depth] = None
+
+    def teleport(self, slot, v):
+        """Move the sprite in SLOT by V. Its cells are updated too, as the sprite
+        manager re-buckets it: step() only reports later crossings."""
+        self.x[slot] += v.x
+        self.y[slot] += v.y
+        self.cells[slot] = self.cells_range(slot)
+
+    def slots_at(self, depth):
+        slots = self.depth_slots.get(depth)
+        if slots is None:
+            slots = np.flatnonzero(self.alive & (self.depth == depth))
+            self.depth_slots[depth] = slots
+        return slots
+
+    def cells_range(self, slots):
+        c = self.cell
+        hw = self.width[slots] / 2
+        hh = self.height[slots] / 2
+        return np.stack([(self.x[slots] - hw) // c,
+                         (self.y[slots] - hh) // c,
+                         (self.x[slots] + hw) // c,
+                         (self.y[slots] + hh) // c], axis=-1).astype(np.int64)
+
+    def offscreen(self, depth, width, height):
+        """Sprites at DEPTH more than their margin off a WIDTH x HEIGHT screen."""
+        slots = self.slots_at(depth)
+        hw = self.width[slots] / 2 + self.margin[slots, 0]
+        hh = self.height[slots] / 2 + self.margin[slots, 1]
+        x = self.x[slots]
+        y = self.y[slots]
+        out = (x <= -hw) | (x >= width + hw) | (y <= -hh) | (y >= height + hh)
+        return [self.sprites[slot] for slot in slots[out]]
+
+    def step(self, depth):
+        """Move every sprite at DEPTH along its path.
+
+        Return the sprites that moved to other grid cells.
+
+        """
+        slots = self.slots_at(depth)
+        current = self.current[slots]
+        length = self.length[slots]
+
+        # A path which is not a loop stops at its last move.
+        moving = current < length
+        if not moving.all():
+            slots = slots[moving]
+            current = current[moving]
+            length = length[moving]
+
+        k = self.offset[slots] + current
+        self.x[slots] += self.moves[k, 0]
+        self.y[slots] += self.moves[k, 1]
+
+        current += 1
+        current[(current == length) & self.loop[slots]] = 0
+        self.current[slots] = current
+
+        cells = self.cells_range(slots)
+        crossed = (cells != self.cells[slots]).any(axis=1)
+        if not crossed.any():
+            return []
+        self.cells[slots[crossed]] = cells[crossed]
+        return [self.sprites[slot] for slot in slots[crossed]]
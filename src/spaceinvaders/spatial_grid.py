@@ -0,0 +1,157 @@
+
+class SpatialGrid:
+    """A uniform grid bucketing sprites by the CELL x CELL pixels cells their
+    collision box overlaps.
+
+    Sprites are bucketed per class so that a query for invaders never walks the
+    stars. The grid is only a broad phase: query_rect() returns the sprites whose
+    collision box overlaps the given rectangle, and pairs() the pairs of sprites
+    sharing a cell, it's still up to the caller to run the exact test.
+
+    """
+
+    def __init__(self, cell=16):
+        assert cell > 0, "Cell size must be greater than 0"
+        self.cell = cell
+        self.reset()
+
+    def reset(self):
+        # Class name => (cx, cy) => {sprite: None}
+        self.cells = {}
+
+        # Sprite => (cx0, cy0, cx1, cy1), the range of cells it's bucketed in.
+        self.ranges = {}
+
+        # Sprite => insertion rank, used to return sprites in attach order.
+        self.ranks = {}
+        self.next_rank = 0
+        return self
+
+    def cells_range(self, left, top, right, bottom):
+        """Range of cells covered by the rectangle, borders included."""
+        c = self.cell
+        return (int(left // c),  int(top // c),
+                int(right // c), int(bottom // c))
+
+    def __contains__(self, sprite):
+        return sprite in self.ranges
+
+    def insert(self, sprite):
+        self.ranks[sprite] = self.next_rank
+        self.next_rank += 1
+
+        r = self.cells_range(sprite.left, sprite.top, sprite.right, sprite.bottom)
+        self.ranges[sprite] = r
+        self.add_to_cells(sprite, r)
+
+    def remove(self, sprite):
+        r = self.ranges.pop(sprite, None)
+        if r is None:
+            return
+        del self.ranks[sprite]
+        self.remove_from_cells(sprite, r)
+
+    def move(self, sprite):
+        """Re-bucket SPRITE after it moved. Unknown sprites are ignored."""
+        old = self.ranges.get(sprite)
+        if old is None:
+            return
+        new = self.cells_range(sprite.left, sprite.top, sprite.right, sprite.bottom)
+        if new == old:
+            return
+        self.remove_from_cells(sprite, old)
+        self.ranges[sprite] = new
+        self.add_to_cells(sprite, new)
+
+    def add_to_cells(self, sprite, r):
+        cls = type(sprite).__name__
+        if cls in self.cells:
+            grid = self.cells[cls]
+        else:
+            grid = self.cells[cls] = {}
+
+        (cx0, cy0, cx1, cy1) = r
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                key = (cx, cy)
+                if key in grid:
+                    grid[key][sprite] = None
+                else:
+                    grid[key] = {sprite: None}
+
+    def remove_from_cells(self, sprite, r):
+        grid = self.cells[type(sprite).__name__]
+        (cx0, cy0, cx1, cy1) = r
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                key = (cx, cy)
+                bucket = grid[key]
+                del bucket[sprite]
+                if not bucket:
+                    del grid[key]
+
+    def pairs(self, group_a, group_b):
+        """The (a, b) pairs of sprites from GROUP_A and GROUP_B sharing a cell,
+        ordered as if walking GROUP_B for each sprite of GROUP_A.
+
+        Both groups are lists of sprites of one class each, all in the grid. The
+        smaller one is walked, looking up the other one's buckets.
+
+        """
+        flip = len(group_b) < len(group_a)
+        (walked, other) = (group_b, group_a) if flip else (group_a, group_b)
+        grid = self.cells.get(type(other[0]).__name__)
+        if not grid:
+            return []
+
+        ranges = self.ranges
+        found = {}
+        for sprite in walked:
+            (cx0, cy0, cx1, cy1) = ranges[sprite]
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = grid.get((cx, cy))
+                    if not bucket:
+                        continue
+                    for match in bucket:
+                        if match.destroyed:
+                            continue
+                        if flip:
+                            found[(match, sprite)] = None
+                        else:
+                            found[(sprite, match)] = None
+
+        ranks = self.ranks
+        return sorted(found, key=lambda pair: (ranks[pair[0]], ranks[pair[1]]))
+
+    def query_rect(self, tlc, width, height, cls):
+        """Sprites of class CLS whose collision box overlaps the given rectangle.
+
+        Sprites are returned in the order they were inserted, so that callers
+        walking the result see the same order as SpriteManager.get().
+
+        """
+        grid = self.cells.get(cls)
+        if not grid:
+            return []
+
+        (x, y) = tlc
+        (right, bottom) = (x + width, y + height)
+        (cx0, cy0, cx1, cy1) = self.cells_range(x, y, right, bottom)
+        found = {}
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = grid.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        sprites = []
+        for sprite in found:
+            if sprite.destroyed:
+                continue
+            if sprite.left <= right and x <= sprite.right \
+               and sprite.top <= bottom and y <= sprite.bottom:
+                sprites.append(sprite)
+        if len(sprites) > 1:
+            sprites.sort(key=self.ranks.__getitem__)
+        return sprites
@@ -0,0 +1,56 @@
+
+import logging
+from fractions import Fraction
+from heapq import heappush
+from math import ceil, floor
+
+from spaceinvaders import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class Spawner:
+    """Spawn a new sprite with the CLS class every FREQ ticks, via MANAGER.
+
+    The n-th sprite is due at tick n * FREQ. FREQ may be lower than 1, e.g., 0.25
+    spawns 4 sprites per tick, or not an integer, e.g., 1.5 spawns 2 sprites every
+    3 ticks. Between two spawns, the spawner waits in MANAGER's scheduler.
+
+    """
+
+    __slots__ = ("manager", "cls", "freq", "count", "timer")
+
+    def __init__(self, manager, cls, freq):
+        assert freq > 0, "Frequency must be greater than 0"
+        self.manager = manager
+        self.cls = cls
+
+        # Exact, so that n * FREQ lands on the right tick, e.g., for 0.1.
+        self.freq = Fraction(freq).limit_denominator(1000)
+
+        # Number of sprites spawned so far, counting from tick 0.
+        scheduler = manager.scheduler
+        self.count = ceil(scheduler.tick / self.freq)
+        self.timer = scheduler.at(ceil(self.count * self.freq), self)
+
+    def restore(self, count, seq):
+        """Wait again, in the manager's scheduler, with COUNT sprites spawned so far
+        and SEQ as the timer's tie-breaker, e.g., when restoring a snapshot."""
+        self.count = count
+        self.timer.due = ceil(count * self.freq)
+        scheduler = self.manager.scheduler
+        heappush(scheduler.heap, (self.timer.due, seq, self.timer))
+
+    def __call__(self):
+        manager = self.manager
+        scheduler = manager.scheduler
+        due = floor(scheduler.tick / self.freq) + 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Will spawn: {due - self.count} {self.cls.__name__}")
+        for i in range(due - self.count):
+            manager.attach( manager.acquire(self.cls) )
+        self.count = due
+
+        # Wait for the next one.
+        self.timer.due = ceil(due * self.freq)
+        scheduler.push(self.timer)
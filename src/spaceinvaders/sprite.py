@@ -1,67 +1,226 @@
 
-import pyxel
-
+from spaceinvaders                import DEBUG
+from spaceinvaders.backend        import pyxel
 from spaceinvaders.path           import Path
-from spaceinvaders.sprite_manager import SpriteManager
 from spaceinvaders.vector         import Vector
 
 
 class Sprite:
     """A sprite is an animated object moving around on the screen. It can collide with other sprites.
 
+    A sprite belongs to the WORLD it was built for, and only ever talks to that
+    world's sprite manager, rocket, random number generator, ...
+
     A sprite have a DEPTH to help decide which sprite to draw on top of the other.
 
     The position (POS) of a sprite is the (x, y) coordinates of its center.
     While it's TLC is the (x, y) coordinates of its top left corner. TLC is used to draw of its animation.
 
+    The LEFT, TOP, RIGHT and BOTTOM sides of its box are cached, from its half
+    width (HW) and half height (HH), and kept up to date as the sprite moves.
+
     Movement is described by its PATH.
+
+    Once attached to a sprite manager using the structure-of-arrays storage, the
+    sprite becomes a view over it: its position and path state live in the
+    STORAGE, at index SLOT, until it's detached.
+
+    Sprites are drawn by the sprite manager's render queue, unless their class
+    overrides draw(). An OPAQUE sprite has no transparent pixel: the sprites it
+    fully covers at lower depths aren't drawn at all.
+
+    Attached sprites are destroyed by the sprite manager once they're more than
+    their class' MARGIN = (mx, my) pixels off screen, horizontally or vertically.
     """
 
-    def __init__(self, depth, pos: Vector, path: Path, animation):
+    __slots__ = ("world", "animation", "depth", "height", "img", "path", "width", "hw", "hh",
+                 "_pos", "_left", "_top", "_right", "_bottom", "storage", "slot", "destroyed")
+
+    opaque = False
+
+    # Sprites may spawn, or wander, up to one tile off screen.
+    margin = (16, 16)
+
+    # Drawn by the render queue? False when the class overrides draw().
+    batched = True
+
+    # Class name => class, to rebuild sprites from snapshots.
+    subclasses = {}
+
+    # Number of the class, from 1 on, e.g., to tell sprites apart in arrays.
+    kind = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.batched = cls.draw is Sprite.draw
+        Sprite.subclasses[cls.__name__] = cls
+        cls.kind = len(Sprite.subclasses)
+
+    def __init__(self, world, depth, pos: Vector, path: Path, animation):
         assert isinstance(pos,  Vector), "pos must be a Vector"
         assert isinstance(path, Path),   "path must be a Path"
 
+        self.world     = world
         self.animation = animation
         self.depth     = depth
         self.height    = animation.height
         self.img       = animation.img
         self.path      = path
         self.width     = animation.width
+        self.hw        = animation.width / 2
+        self.hh        = animation.height / 2
+
+        self._pos    = pos
+        self.storage = None
+        self.slot    = None
+        self.update_bounds()
 
-        self.pos         = pos
-        (self.x, self.y) = self.pos.to_tuple() # Retro compatibility
+        Sprite.reset(self)
 
-        self.reset()
+    def reset(self, pos=None):
+        """Bring the sprite back to its initial state, at POS if given.
 
-    def reset(self):
+        It's the hook used to recycle pooled sprites: subclasses override it to
+        take the same arguments as their constructor.
+
+        """
         self.destroyed = False
+        if pos is None:
+            return
+        if DEBUG:
+            assert self.storage is None, "Can't reset an attached sprite"
+        self._pos = pos.copy()
+        self.update_bounds()
+        self.path.current = 0
+        self.animation.reset()
+
+    @classmethod
+    def blank(cls, world):
+        """A sprite of this class for WORLD, not initialized yet, to restore a
+        snapshot into."""
+        return cls.__new__(cls)
+
+    def state(self):
+        """What a snapshot needs to know about the sprite, beyond its position,
+        path and animation, as a tuple of ints. See set_state()."""
+        return ()
+
+    def set_state(self, state):
+        """Restore the STATE returned by state()."""
+        pass
+
+    @property
+    def pos(self):
+        """Center's coordinates. It's a copy when the sprite lives in a storage."""
+        if self.storage is None:
+            return self._pos
+        return Vector(self.x, self.y)
+
+    @property
+    def x(self):
+        if self.storage is None:
+            return self._pos.x
+        return self.storage.x[self.slot].item()
+
+    @property
+    def y(self):
+        if self.storage is None:
+            return self._pos.y
+        return self.storage.y[self.slot].item()
+
+    # The storage moves its sprites without telling them: their sides are
+    # computed from its arrays.
+
+    @property
+    def left(self):
+        if self.storage is None:
+            return self._left
+        return self.storage.x[self.slot].item() - self.hw
+
+    @property
+    def top(self):
+        if self.storage is None:
+            return self._top
+        return self.storage.y[self.slot].item() - self.hh
+
+    @property
+    def right(self):
+        if self.storage is None:
+            return self._right
+        return self.storage.x[self.slot].item() + self.hw
+
+    @property
+    def bottom(self):
+        if self.storage is None:
+            return self._bottom
+        return self.storage.y[self.slot].item() + self.hh
+
+    def update_bounds(self):
+        """Recompute the cached sides after _pos changed."""
+        pos = self._pos
+        self._left   = pos.x - self.hw
+        self._top    = pos.y - self.hh
+        self._right  = pos.x + self.hw
+        self._bottom = pos.y + self.hh
 
     def tlc(self):
         """Top left corner's coordinates."""
-        return (self.x - self.width / 2,
-                self.y - self.height / 2)
-
-    def update_frame(self):
-        self.animation.next_frame()
+        return (self.left, self.top)
 
     def teleport(self, v):
         """Teleport the sprite along vector V."""
-        self.pos += v
-        (self.x, self.y) = self.pos.to_tuple() # Retro compatibility
+        if v.x == 0 and v.y == 0:
+            return
+        if self.storage is None:
+            pos = self._pos
+            pos += v
+            self._left   = pos.x - self.hw
+            self._top    = pos.y - self.hh
+            self._right  = pos.x + self.hw
+            self._bottom = pos.y + self.hh
+        else:
+            self.storage.teleport(self.slot, v)
+        self.world.manager.move(self)
 
     def update(self):
-        """Update position"""
-        assert isinstance(self.path, Path), "self.path must be a Path"
-        self.update_frame()
-        self.teleport( self.path.next_move() )
+        """Update position, unless the storage already moved the sprite.
+
+        The animation follows the sprite manager's ticks by itself.
+
+        """
+        if DEBUG:
+            assert isinstance(self.path, Path), "self.path must be a Path"
+        if self.storage is None:
+            self.teleport( self.path.next_move() )
+
+    def advance(self, steps):
+        """Move the sprite STEPS moves further along its path, at once."""
+        storage = self.storage
+        if storage is not None:
+            self.path.current = storage.current[self.slot].item()
+        self.teleport( self.path.advance(steps) )
+        if storage is not None:
+            storage.current[self.slot] = self.path.current
+
+    def play(self, animation):
+        """Switch to ANIMATION. The current one is frozen until played again."""
+        if animation is self.animation:
+            return
+        clock = self.animation.clock
+        self.animation.unbind()
+        if clock is not None:
+            animation.bind(clock)
+        self.animation = animation
 
     def draw(self):
-        self.animation.draw_at(self.tlc())
+        self.animation.draw_at((self.left, self.top))
 
-    def is_visible(self):
-        """Tell if the sprite can be found somewhere on the screen."""
-        hh = self.height / 2
-        return self.y < pyxel.height + hh or self.y < -hh
+    def is_visible(self, margin=(0, 0)):
+        """Tell if the sprite can be found somewhere on the screen, grown by
+        MARGIN = (mx, my) pixels on every side."""
+        (mx, my) = margin
+        return -mx < self.right and self.left < pyxel.width + mx \
+            and -my < self.bottom and self.top < pyxel.height + my
 
     def is_done(self):
         """Tell if sprite's animation is still running."""
@@ -69,8 +228,7 @@ class Sprite:
 
     def collide_with_point(self, p):
         (px, py) = p
-        (x, y) = self.tlc()
-        return x <= px and px <= x + self.width and y <= py and py <= y + self.height
+        return self.left <= px <= self.right and self.top <= py <= self.bottom
 
     def collide_with_rect_1(self, tlc, width, height):
         return self.collide_with_point(tlc)
@@ -102,8 +260,14 @@ class Sprite:
         """
         if self.destroyed or other_sprite.destroyed:
             return False
-        return self.collide_with_rect(other_sprite.tlc(),
-                                      other_sprite.width, other_sprite.height)
+
+        # One of the other sprite's corners is inside this one if one of its
+        # sides is within it horizontally, and one vertically.
+        (left, top, right, bottom) = (self.left, self.top, self.right, self.bottom)
+        (x0, x1) = (other_sprite.left, other_sprite.right)
+        (y0, y1) = (other_sprite.top, other_sprite.bottom)
+        return (left <= x0 <= right or left <= x1 <= right) \
+            and (top <= y0 <= bottom or top <= y1 <= bottom)
 
     def draw_debug_overlay(self):
         """Draw sprite's debug overlay.
@@ -114,8 +278,7 @@ class Sprite:
         color = 8
 
         # Collision box
-        (x, y) = self.tlc()
-        pyxel.rectb(x, y, self.width, self.height, color)
+        pyxel.rectb(self.left, self.top, self.width, self.height, color)
 
         # Center
         pyxel.pset(self.x, self.y - 1, color)
@@ -125,9 +288,12 @@ class Sprite:
         pyxel.pset(self.x + 1, self.y, color)
 
     def destroy(self):
-        assert not self.destroyed, "Already destroyed"
-        SpriteManager().detach(self)
+        """Destroy the sprite. Destroying it again, e.g., when hit twice during the
+        same frame, does nothing."""
+        if self.destroyed:
+            return
         self.destroyed = True
+        self.world.manager.detach(self)
 
     def hit_by(self, sprite):
         """What to do when another sprite hit this one?"""
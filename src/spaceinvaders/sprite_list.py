@@ -0,0 +1,56 @@
+from spaceinvaders import DEBUG
+
+
+class SpriteList:
+    """An insertion ordered collection of sprites with O(1) append and remove.
+
+    A removed sprite leaves a tombstone (None) in its slot instead of shifting the
+    sprites after it. Tombstones are skipped while iterating and squeezed out by
+    compact(), which the sprite manager runs once per frame.
+
+    Iterating is safe while sprites are appended or removed: appended sprites are
+    visited, removed ones are not.
+
+    """
+
+    def __init__(self):
+        self.slots = []
+
+        # Sprite => index of its slot.
+        self.index = {}
+
+        # Number of tombstones in self.slots.
+        self.holes = 0
+
+    def append(self, sprite):
+        if DEBUG:
+            assert sprite not in self.index, "Sprite already in the list"
+        self.index[sprite] = len(self.slots)
+        self.slots.append(sprite)
+
+    def remove(self, sprite):
+        i = self.index.pop(sprite)
+        self.slots[i] = None
+        self.holes += 1
+
+    def compact(self):
+        """Squeeze the tombstones out. Must not be called while iterating."""
+        if self.holes == 0:
+            return
+        self.slots = [sprite for sprite in self.slots if sprite is not None]
+        self.index = {sprite: i for (i, sprite) in enumerate(self.slots)}
+        self.holes = 0
+
+    def __iter__(self):
+        return filter(None, self.slots)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, sprite):
+        return sprite in self.index
+
+    def __getitem__(self, i):
+        if self.holes == 0:
+            return self.slots[i]
+        return list(self)[i]
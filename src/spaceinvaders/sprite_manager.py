@@ -1,20 +1,29 @@
 
 import logging
-
-import pyxel
+from time import perf_counter
 
 from spaceinvaders                import LOGGER_NAME
-from spaceinvaders.meta_singleton import MetaSingleton
+from spaceinvaders.backend        import pyxel
+from spaceinvaders.collision      import collide_many
+from spaceinvaders.profiler       import Profiler
+from spaceinvaders.render_queue   import RenderQueue
+from spaceinvaders.scheduler      import Scheduler
+from spaceinvaders.soa_storage    import SoAStorage
+from spaceinvaders.spatial_grid   import SpatialGrid
+from spaceinvaders.spawner        import Spawner
+from spaceinvaders.sprite_list    import SpriteList
+from spaceinvaders.sprite_pool    import SpritePool
 
 logger = logging.getLogger(LOGGER_NAME)
 
 
-class SpriteManager(metaclass=MetaSingleton):
-    """Help manage sprites.
+class SpriteManager:
+    """Help manage the sprites of a WORLD.
 
     Once a sprite is attached to the manager, it starts being automatically updated
     and drawn. Its destruction is also automatically triggered when it leaves the
-    screen or its animation is over.
+    screen, by more than its class' margin, or its animation is over. Only the
+    sprites which moved are looked at to tell if they left the screen.
 
     Sprites are sorted by depth and classes. Use get() to retrieve all the sprites
     from a given class.
@@ -28,33 +37,173 @@ class SpriteManager(metaclass=MetaSingleton):
     The manager also provide automatic sprite generation at a given frequency via
     spawn().
 
+    Spawns and anything else that happens every so many ticks wait in the
+    manager's SCHEDULER, which only wakes up what is due: a tick doesn't cost
+    more because many sprites are waiting. The scheduler counts the manager's
+    updates, so nothing advances while the game is paused. Animations of the
+    attached sprites read their current frame from its tick.
+
+    Detached sprites of the classes registered via pool() are recycled: build
+    sprites with acquire() rather than calling their class directly.
+
+    Collisions between two classes of sprites are looked for once per frame, in a
+    single batched test, once registered via collide(). Only the sprites sharing
+    a cell of the grid below are tested.
+
+    While update() runs, attach() and detach() are buffered and applied in one
+    batch at the end of the frame, so the sprite lists are never modified while
+    being walked.
+
+    Sprite positions either live in the sprites themselves or, after use_soa(),
+    in a structure-of-arrays storage which moves all the sprites of a depth in
+    one vectorized step.
+
+    Sprites are drawn through a render queue which blits them in one batch,
+    skipping those offscreen or hidden behind opaque sprites.
+
+    Attached sprites are also indexed in a uniform grid so that collision code can
+    ask for the sprites around a rectangle via query_rect() instead of walking a
+    whole class.
+
+    The whole state of the game can be saved between two ticks with snapshot(),
+    then brought back with restore(), e.g., to rewind the game.
+
     """
 
-    def __init__(self):
+    def __init__(self, world, soa=False):
+        self.world = world
+        self.soa = soa
+        self.profiler = Profiler()
+        self.render_queue = RenderQueue()
+        self.plans = []
+        self.storage = None
         self.reset()
 
+    def use_soa(self, enabled=True):
+        """Switch to (or from) the structure-of-arrays storage. Reset the manager."""
+        self.soa = enabled
+        return self.reset()
+
     def reset(self):
-        self.plans = [[], [], [], []]
+        # Timers, run at the beginning of every update:
+        self.scheduler = Scheduler()
+        self.spawners = []
+
+        # (class, class) pairs to look for collisions between:
+        self.collisions = []
+
+        # Class name => SpritePool:
+        self.pools = {}
+
+        self.clear()
+        return self
+
+    def clear(self):
+        """Drop every sprite, e.g., before restoring a snapshot. The spawners and
+        the other rules of the game are kept.
+
+        Dropped sprites get their state back from the storage, e.g., the rocket,
+        which outlives snapshots.
+
+        """
+        for plan in self.plans:
+            for sprite in plan:
+                sprite.animation.unbind()
+        if self.storage is not None:
+            for sprite in self.storage.sprites:
+                if sprite is not None:
+                    self.storage.remove(sprite)
+
+        self.plans = [SpriteList(), SpriteList(), SpriteList(), SpriteList()]
 
         # Sprites sorted by class:
         self.classes = {}
 
-        self.frequencies = {}
-        return self
+        # Sprites sorted by location:
+        self.grid = SpatialGrid()
+
+        # Sprites which moved since the last cull():
+        self.moved = []
+
+        # Positions and motion of the sprites in SoA mode:
+        if self.soa:
+            self.storage = SoAStorage(cell=self.grid.cell)
+        else:
+            self.storage = None
+
+        # Attach/detach commands buffered during update():
+        self.updating = False
+        self.pending = []
+
+    def snapshot(self):
+        """The whole state of the game, as compact bytes. See snapshot.py."""
+        from spaceinvaders.snapshot import dump
+        return dump(self)
+
+    def restore(self, snapshot):
+        """Bring the game back to SNAPSHOT, returned by snapshot()."""
+        from spaceinvaders.snapshot import load
+        load(self, snapshot)
 
     def attach(self, sprite):
+        if self.updating:
+            self.pending.append((self.apply_attach, sprite))
+        else:
+            self.apply_attach(sprite)
+
+    def detach(self, sprite):
+        if self.updating:
+            self.pending.append((self.apply_detach, sprite))
+        else:
+            self.apply_detach(sprite)
+
+    def apply_attach(self, sprite):
+        self.attach_lists(sprite)
+        if self.storage is not None:
+            self.storage.add(sprite)
+        self.grid.insert(sprite)
+        sprite.animation.bind(self.scheduler)
+
+    def attach_many(self, sprites):
+        """Attach SPRITES right away, in order, filling the storage in one go,
+        e.g., when restoring a snapshot."""
+        assert not self.updating, "Can't attach many sprites while updating"
+        scheduler = self.scheduler
+        for sprite in sprites:
+            self.attach_lists(sprite)
+            self.grid.insert(sprite)
+            sprite.animation.bind(scheduler)
+        if self.storage is not None:
+            self.storage.add_many(sprites)
+
+    def attach_lists(self, sprite):
         self.plans[sprite.depth].append(sprite)
 
         cls = type(sprite).__name__
         if cls in self.classes:
             self.classes[cls].append(sprite)
         else:
-            self.classes[cls] = [sprite]
+            self.classes[cls] = SpriteList()
+            self.classes[cls].append(sprite)
 
-    def detach(self, sprite):
+    def apply_detach(self, sprite):
         self.plans[sprite.depth].remove(sprite)
         cls = type(sprite).__name__
         self.classes[cls].remove(sprite)
+        self.grid.remove(sprite)
+        sprite.animation.unbind()
+        if sprite.storage is not None:
+            sprite.storage.remove(sprite)
+        if cls in self.pools:
+            self.pools[cls].release(sprite)
+
+    def move(self, sprite):
+        """Tell the manager SPRITE moved so that its grid cells are updated, and
+        that it may have left the screen. Sprites not attached are ignored."""
+        grid = self.grid
+        if sprite in grid:
+            grid.move(sprite)
+            self.moved.append(sprite)
 
     def get(self, cls):
         if cls in self.classes:
@@ -63,48 +212,69 @@ class SpriteManager(metaclass=MetaSingleton):
             sprites = []
         return sprites
 
+    def query_rect(self, tlc, width, height, cls):
+        """Sprites from the CLS class overlapping the WIDTH x HEIGHT rectangle at TLC."""
+        return self.grid.query_rect(tlc, width, height, cls)
+
+    def pool(self, cls, capacity):
+        """Tell the manager to keep up to CAPACITY destroyed CLS sprites for reuse."""
+        self.pools[cls.__name__] = SpritePool(cls, capacity)
+
+    def acquire(self, cls, *args):
+        """Return a CLS sprite built with ARGS, recycled from its pool if possible."""
+        pool = self.pools.get(cls.__name__)
+        if pool is None:
+            return cls(self.world, *args)
+        return pool.acquire(self.world, *args)
+
+    def pool_stats(self):
+        """Hits, misses, ... of every pool, by class name."""
+        return {cls: pool.stats() for (cls, pool) in self.pools.items()}
+
     def spawn(self, cls, freq):
-        """Tell the manager to spawn a new sprite with the CLS class every FREQ frames."""
-        #assert type(freq) is int, "Frequency must be an integer"
-        if freq in self.frequencies:
-            self.frequencies[freq].append(cls)
-        else:
-            self.frequencies[freq] = [cls]
+        """Tell the manager to spawn a new sprite with the CLS class every FREQ ticks.
+
+        FREQ may be lower than 1 to spawn several sprites per tick.
+
+        """
+        self.spawners.append(Spawner(self, cls, freq))
+
+    def collide(self, cls_a, cls_b):
+        """Tell the manager to look for collisions between CLS_A and CLS_B sprites every frame.
+
+        Colliding sprites are hit by each other: first a.hit_by(b), then b.hit_by(a).
+
+        """
+        self.collisions.append((cls_a, cls_b))
+
+    def handle_collisions(self):
+        for (cls_a, cls_b) in self.collisions:
+            for (a, b) in collide_many(self.get(cls_a), self.get(cls_b), self.grid):
+                # Already hit by another sprite during this frame?
+                if a.destroyed or b.destroyed:
+                    continue
+                a.hit_by(b)
+                b.hit_by(a)
 
     def update(self):
         """Update the sprites under manager's control taking care to destroy them if necessary.
 
-        Also spawn new sprites if necessary.
+        Also run the timers due, e.g., to spawn new sprites.
 
         """
-        # Update sprites, destroying them when necessary.
+        if self.profiler.enabled:
+            self.update_profiled()
+            return
+
+        self.updating = True
+        self.run_timers()
         for depth in range(0, len(self.plans)):
-            for sprite in self.plans[depth]:
-                sprite.update()
-
-                # Destroy the sprite if:
-                # - it left the screen
-                # - or it's animation is done.
-                if not sprite.is_visible() or sprite.is_done():
-                    logger.debug(f"is_visible: {sprite.is_visible()}")
-                    logger.debug(f"is_done:    {sprite.is_done()}")
-                    sprite.destroy()
-
-        # Auto-spawn sprites.
-        for freq, classes in self.frequencies.items():
-            sprcount = 1
-            if freq < 1:
-                # 0.5   => Spawn 2 sprites
-                # 0.25  => Spawn 4 sprites
-                # 0.125 => Spawn 8 sprites
-                if freq == 0.5:
-                    sprcount = 2
-            if pyxel.frame_count % freq != 0:
-                continue
-            logger.debug(f"Will spawn: {classes}")
-            for cls in classes:
-                for i in range(sprcount):
-                    self.attach( cls() )
+            self.update_depth(depth)
+        self.cull()
+        self.handle_collisions()
+        self.updating = False
+        self.flush()
+        self.scheduler.advance()
 
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Sprite Plans:")
@@ -113,12 +283,130 @@ class SpriteManager(metaclass=MetaSingleton):
             logger.debug("Sprite Classes:")
             for cls, sprites in self.classes.items():
                 logger.debug(f"    {cls}: {len(sprites)}")
+            logger.debug("Sprite Pools:")
+            for cls, stats in self.pool_stats().items():
+                logger.debug(f"    {cls}: {stats}")
+
+    def update_profiled(self):
+        """Same as update(), timing every part of it."""
+        profiler = self.profiler
+        start = perf_counter()
+
+        self.updating = True
+        t = perf_counter()
+        self.run_timers()
+        profiler.add("timers", perf_counter() - t)
+
+        for depth in range(0, len(self.plans)):
+            t = perf_counter()
+            self.update_depth_profiled(depth)
+            profiler.add(f"update[{depth}]", perf_counter() - t)
+
+        t = perf_counter()
+        self.cull()
+        profiler.add("cull", perf_counter() - t)
+
+        t = perf_counter()
+        self.handle_collisions()
+        profiler.add("collisions", perf_counter() - t)
+
+        self.updating = False
+        t = perf_counter()
+        self.flush()
+        profiler.add("flush", perf_counter() - t)
+        self.scheduler.advance()
+
+        profiler.add("update", perf_counter() - start)
+        profiler.end_frame()
+
+    def update_depth(self, depth):
+        """Update the sprites at DEPTH, destroying them when necessary."""
+        if self.storage is not None:
+            self.step(depth)
+
+        for sprite in self.plans[depth]:
+            # Destroyed earlier this frame, e.g., hit by a projectile.
+            if sprite.destroyed:
+                continue
+
+            sprite.update()
+            if not sprite.destroyed and sprite.is_done():
+                sprite.destroy()
+
+    def update_depth_profiled(self, depth):
+        """Same as update_depth(), timing every class."""
+        profiler = self.profiler
+        if self.storage is not None:
+            t = perf_counter()
+            self.step(depth)
+            profiler.add(f"step[{depth}]", perf_counter() - t)
+
+        for sprite in self.plans[depth]:
+            if sprite.destroyed:
+                continue
+
+            t = perf_counter()
+            sprite.update()
+            if not sprite.destroyed and sprite.is_done():
+                sprite.destroy()
+            profiler.add("update." + type(sprite).__name__, perf_counter() - t)
+
+    def step(self, depth):
+        """Move the sprites at DEPTH along their path, in the storage, destroying
+        those which left the screen."""
+        storage = self.storage
+        for sprite in storage.step(depth):
+            self.grid.move(sprite)
+        # In update order rather than slots order, which a restored game doesn't
+        # share with the original one.
+        offscreen = storage.offscreen(depth, pyxel.width, pyxel.height)
+        for sprite in sorted(offscreen, key=self.plans[depth].index.get):
+            sprite.destroy()
+
+    def cull(self):
+        """Destroy the sprites which moved off screen, by more than their margin."""
+        moved = self.moved
+        self.moved = []
+        grid = self.grid
+        for sprite in moved:
+            # Destroyed, or detached since it moved.
+            if sprite.destroyed or sprite not in grid:
+                continue
+            if not sprite.is_visible(sprite.margin):
+                sprite.destroy()
+
+    def run_timers(self):
+        """Run the timers due this tick, e.g., spawns."""
+        self.scheduler.run()
+
+    def flush(self):
+        """Apply the buffered attach/detach commands, in order, then squeeze out
+        the detached sprites."""
+        pending = self.pending
+        self.pending = []
+        for (command, sprite) in pending:
+            command(sprite)
+        self.compact()
+
+    def compact(self):
+        for sprites in self.plans:
+            sprites.compact()
+        for sprites in self.classes.values():
+            sprites.compact()
 
     def draw(self):
         """Draw the sprites under manager's control taking into account their depth."""
-        for sprites in self.plans:
-            for sprite in sprites:
-                sprite.draw()
+        profiler = self.profiler
+        if profiler.enabled:
+            start = perf_counter()
+
+        queue = self.render_queue
+        for (depth, sprites) in enumerate(self.plans):
+            queue.extend(depth, sprites)
+        queue.flush()
+
+        if profiler.enabled:
+            profiler.add("draw", perf_counter() - start)
 
         if logger.isEnabledFor(logging.DEBUG):
             for cls in ["Invader", "Rocket", "RocketProjectile"]:
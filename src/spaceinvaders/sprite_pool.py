@@ -0,0 +1,45 @@
+
+class SpritePool:
+    """Recycle destroyed sprites of the CLS class instead of building new ones.
+
+    Up to CAPACITY detached sprites are kept around. acquire() hands one back,
+    brought back to life via its reset() hook which takes the same arguments as
+    the class constructor but for the world, or builds a new one when the pool is empty.
+
+    """
+
+    def __init__(self, cls, capacity):
+        assert capacity >= 0, "Capacity must be greater than or equal to 0"
+        self.cls = cls
+        self.capacity = capacity
+        self.free = []
+
+        # Statistics:
+        self.hits = 0      # acquire() served by a recycled sprite
+        self.misses = 0    # acquire() had to build a new sprite
+        self.dropped = 0   # release() found the pool full
+
+    def acquire(self, world, *args):
+        """A sprite for WORLD, built with ARGS."""
+        if self.free:
+            self.hits += 1
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            return sprite
+        self.misses += 1
+        return self.cls(world, *args)
+
+    def release(self, sprite):
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "free":     len(self.free),
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "dropped":  self.dropped,
+        }
@@ -1,25 +1,44 @@
 
-from random import randrange
-
-import pyxel
-
 from spaceinvaders.animation      import Animation, TOP_TO_BOTTOM
-from spaceinvaders.path           import Path
+from spaceinvaders.backend        import pyxel
+from spaceinvaders.path           import Path, compile_moves
 from spaceinvaders.sprite         import Sprite
 from spaceinvaders.vector         import Vector
 from spaceinvaders.vertical_speed import VerticalSpeed
 
+# Speed => interned path table of the stars falling at that speed:
+_tables = {}
+
+
+def falling(speed):
+    """Interned path table of a star falling at SPEED pixels per tick."""
+    table = _tables.get(speed)
+    if table is None:
+        table = _tables[speed] = compile_moves([VerticalSpeed(float(speed))])
+    return table
+
 
 class Star(Sprite):
 
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(self, world):
+        randrange = world.rng.randrange
         animation = Animation(1,                        # img
                               8, 8,                     # width, height
                               randrange(0, 7) * 8, 16,  # origx, origy
                               1,                        # count
                               direction=TOP_TO_BOTTOM,
                               fps=10)
-        super().__init__(0,                                      # depth
+        super().__init__(world,
+                        0,                                       # depth
                         Vector(randrange(0, pyxel.width-8), -8), # pos
-                        Path([VerticalSpeed(float(randrange(2, 4)))], loop=True),
+                        Path(falling(randrange(2, 4)), loop=True),
                         animation)
+
+    def reset(self):
+        randrange = self.world.rng.randrange
+        self.animation.reset(origx=randrange(0, 7) * 8)
+        pos = Vector(randrange(0, pyxel.width-8), -8)
+        self.path.reset(falling(randrange(2, 4)))
+        super().reset(pos)
@@ -0,0 +1,95 @@
+
+import builtins
+import sys
+from time import perf_counter
+
+from spaceinvaders.meta_singleton import MetaSingleton
+
+# When this module was imported, i.e., right as the entry point started.
+STARTED = perf_counter()
+
+
+class StartupProfiler(metaclass=MetaSingleton):
+    """Time the cold start, from the entry point up to the first frame drawn.
+
+    Once ENABLED, every module imported for the first time is timed, the way
+    python -X importtime does it: SELF is the time spent in the module itself,
+    CUMULATIVE includes the modules it imported. Startup phases, e.g., pyxel's
+    initialization, are timed with mark().
+
+    When not ENABLED, mark() and first_frame() do nothing.
+
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.last = STARTED
+
+        # (phase, seconds), in order:
+        self.phases = []
+
+        # (depth, module, self seconds, cumulative seconds), in the order imports
+        # completed, i.e., modules before the module importing them:
+        self.imports = []
+
+        # Time spent in nested imports, per import being timed:
+        self.stack = []
+
+        self.original_import = None
+
+    def enable(self):
+        """Start timing imports. Time elapsed so far is the "entry point" phase."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.mark("entry point")
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.timed_import
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        builtins.__import__ = self.original_import
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        self.stack.append(0.0)
+        start = perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = perf_counter() - start
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += cumulative
+            self.imports.append((len(self.stack), name, cumulative - nested, cumulative))
+
+    def mark(self, phase):
+        """Record the time spent since the previous mark as PHASE."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def first_frame(self):
+        """Call once the first frame is drawn: report and stop timing."""
+        if not self.enabled:
+            return
+        self.mark("first frame")
+        self.disable()
+        self.report()
+
+    def report(self, file=sys.stderr):
+        print("import time: self [us] | cumulative | imported package", file=file)
+        for (depth, name, own, cumulative) in self.imports:
+            print(f"import time: {own * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}",
+                  file=file)
+        print("startup:", file=file)
+        for (phase, seconds) in self.phases:
+            print(f"    {phase:<16}{seconds * 1000:8.1f} ms", file=file)
+        total = sum(seconds for (phase, seconds) in self.phases)
+        print(f"    {'time to frame':<16}{total * 1000:8.1f} ms", file=file)
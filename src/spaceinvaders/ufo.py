@@ -1,9 +1,7 @@
-import pyxel
-
 from spaceinvaders.animation         import Animation, TOP_TO_BOTTOM
+from spaceinvaders.backend           import pyxel
 from spaceinvaders.path              import Path
 from spaceinvaders.sprite            import Sprite
-from spaceinvaders.sprite_manager    import SpriteManager
 from spaceinvaders.vector            import Vector
 from spaceinvaders.vertical_speed    import VerticalSpeed
 from spaceinvaders.horizontal_speed  import HorizontalSpeed
@@ -11,7 +9,9 @@ from spaceinvaders.horizontal_speed  import HorizontalSpeed
 
 class UFO(Sprite):
 
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(self, world):
         animation = Animation(1,                          # img
                               16, 16,                     # width, height
                               0, 24,                      # origx, origy
@@ -20,9 +20,10 @@ class UFO(Sprite):
         
         r = HorizontalSpeed(1.0)
         l = HorizontalSpeed(-1.0)
-        moves = 128*[r] + 128*[l]
+        runs = [(128, r), (128, l)]
           
-        super().__init__(1,                                  # depth
+        super().__init__(world,
+                         1,                                  # depth
                          Vector(-16, 32),                    # pos
-                         Path(moves, loop=True),             # speed
+                         Path.runs(runs, loop=True),         # speed
                          animation)
@@ -1,11 +1,17 @@
+from spaceinvaders import DEBUG
+
+
 class Vector:
     """A vector.
 
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
-        assert type(x) in (int, float), "x must be a number"
-        assert type(y) in (int, float), "y must be a number"
+        if DEBUG:
+            assert type(x) in (int, float), "x must be a number"
+            assert type(y) in (int, float), "y must be a number"
 
         self.x = x
         self.y = y
@@ -19,9 +25,10 @@ class Vector:
 
     def __iadd__(self, v):
         """All adding vectors in-place, i.e., u += v."""
-        assert isinstance(v, Vector),      "v must be a Vector"
-        assert type(v.x) in (int, float),  "v.x must be a number"
-        assert type(v.y) in (int, float),  "v.y must be a number"
+        if DEBUG:
+            assert isinstance(v, Vector),      "v must be a Vector"
+            assert type(v.x) in (int, float),  "v.x must be a number"
+            assert type(v.y) in (int, float),  "v.y must be a number"
 
         self.x += v.x
         self.y += v.y
@@ -0,0 +1,325 @@
+
+import numpy as np
+
+import spaceinvaders.world
+from spaceinvaders.backend            import pyxel
+from spaceinvaders.controls           import BITS
+from spaceinvaders.invader            import Invader
+from spaceinvaders.invader_projectile import InvaderProjectile
+from spaceinvaders.invader_weapon     import InvaderWeapon
+from spaceinvaders.life_bar           import LifeBar
+from spaceinvaders.path               import compile_runs
+from spaceinvaders.rocket             import Rocket
+from spaceinvaders.rocket_projectile  import RocketProjectile
+
+# Reward of an invader shot down, and of a hit taken by the rocket:
+KILL_REWARD = 1.0
+HIT_REWARD  = -1.0
+
+
+def overlap(a, b):
+    """Tell if the (left, top, width, height) boxes A and B, broadcast against
+    each other, overlap, their sides included.
+
+    It's Sprite.collide_with() for boxes no larger than the other in both
+    dimensions, as every pair here: then the one whose side is within the other
+    horizontally has a side within it vertically too.
+
+    """
+    (ax, ay, aw, ah) = a
+    (bx, by, bw, bh) = b
+    return (ax <= bx + bw) & (bx <= ax + aw) & (ay <= by + bh) & (by <= ay + ah)
+
+
+class Kind:
+    """The geometry of a kind of sprites, read off SPRITE: its (width, height)
+    SIZE, its START position, its SPEED down the screen, i.e., the first move of
+    its path, and the MARGIN it may wander off screen, see Sprite.margin."""
+
+    __slots__ = ("size", "start", "speed", "margin")
+
+    def __init__(self, sprite):
+        self.size   = (sprite.width, sprite.height)
+        self.start  = (sprite.x, sprite.y)
+        self.speed  = sprite.path.moves[0].y
+        self.margin = sprite.margin
+
+
+class Group:
+    """Up to CAPACITY sprites of a kind in each of K worlds: one (K, CAPACITY)
+    array per field, named by FIELDS, a {name: dtype} dictionary, along with
+    their ALIVE mask.
+
+    Between two ticks, the sprites of a world come first, in the order they were
+    added, i.e., in the order of the sprite manager's lists. New sprites which
+    find no room are dropped, and counted.
+
+    """
+
+    def __init__(self, k, capacity, fields):
+        self.capacity = capacity
+        self.rows = np.arange(k)[:, None]
+        self.fields = ["alive", *fields]
+        self.alive = np.zeros((k, capacity), dtype=bool)
+        for (name, dtype) in fields.items():
+            setattr(self, name, np.zeros((k, capacity), dtype=dtype))
+        self.dropped = 0
+
+    def clear(self, worlds):
+        self.alive[worlds] = False
+
+    def compact(self):
+        """Squeeze out the sprites destroyed during the tick."""
+        alive = self.alive
+        # Nothing to do unless a dead sprite comes before a live one.
+        if not (alive[:, 1:] > alive[:, :-1]).any():
+            return
+        order = (self.rows, np.argsort(~alive, axis=1, kind="stable"))
+        for name in self.fields:
+            setattr(self, name, getattr(self, name)[order])
+
+    def add(self, worlds, ranks, **values):
+        """Add a sprite to each of WORLDS, after those of the same world with a
+        lower rank in RANKS, with VALUES as fields. Call compact() first."""
+        slots = self.alive.sum(axis=1)[worlds] + ranks
+        room = slots < self.capacity
+        self.dropped += len(worlds) - np.count_nonzero(room)
+        (worlds, slots) = (worlds[room], slots[room])
+        self.alive[worlds, slots] = True
+        for (name, value) in values.items():
+            getattr(self, name)[worlds, slots] = value if np.isscalar(value) else value[room]
+
+    def boxes(self, size):
+        """The (left, top, width, height) of the collision boxes, for a sprite of SIZE."""
+        (w, h) = size
+        return (self.x - w / 2, self.y - h / 2, w, h)
+
+    def cull(self, kind, width, height):
+        """Destroy the sprites of KIND more than their margin off a WIDTH x HEIGHT
+        screen, as the sprite manager does."""
+        (hw, hh) = (kind.size[0] / 2, kind.size[1] / 2)
+        (mx, my) = kind.margin
+        x = self.x
+        y = self.y
+        self.alive &= (-mx < x + hw) & (x - hw < width + mx) & (-my < y + hh) & (y - hh < height + my)
+
+
+class VectorEnv:
+    """K games stepped in lockstep, held in NumPy arrays rather than sprites.
+
+    It mirrors the rules of World, one tick at a time, for all the worlds at once:
+    invaders march along their path and fire, projectiles fly, the rocket moves
+    and shoots, sprites off screen are dropped, then collisions are handled in the
+    order the sprite manager handles them. Stars, the UFO and explosions are left
+    out: they change nothing to the game. Rules tuned via batch.tune() are read
+    when the environment is built, and so are the screen's size and the sprites'
+    geometry and speeds, off sprites built in a model world.
+
+    Up to INVADERS invaders, INVADER_PROJECTILES of their projectiles and
+    ROCKET_PROJECTILES of the rocket's are kept per world: the game never needs
+    more with the default rules.
+
+    step() takes the buttons held in every world, as masks (see controls.BUTTONS)
+    and returns (observations, rewards, dones). A world is done once its rocket is
+    dead: it starts over right away, and its observation is the new game's.
+
+    The observations are one row of OBSERVATION_SIZE floats per world, overwritten
+    by every step: the rocket's x and hit points (scaled to [0, 1]) and whether
+    its weapon is ready, then for the invaders, the invader projectiles and the
+    rocket projectiles: the dx of every slot, their dy, then their alive flags,
+    relative to the rocket, in screen widths and heights, 0 for empty slots.
+
+    """
+
+    def __init__(self, k, invaders=32, invader_projectiles=32, rocket_projectiles=8):
+        assert k >= 1, "At least one world"
+        self.k = k
+        period = spaceinvaders.world.INVADER_PERIOD
+        assert period == int(period) and period >= 1, "Invader period must be a whole number of ticks"
+        self.invader_period = int(period)
+        self.invader_cooldown = InvaderWeapon.COOLDOWN
+        self.rocket_cooldown = Rocket.COOLDOWN
+        self.max_hit_points = LifeBar.MAX_HIT_POINTS
+
+        self.width = pyxel.width
+        self.height = pyxel.height
+        model = spaceinvaders.world.World(0, soa=False)
+        invader = Invader(model)
+        self.rocket_kind = Kind(model.rocket)
+        self.rocket_speed = model.rocket.rocket_speed
+        self.invader_kind = Kind(invader)
+        self.invader_projectile_kind = Kind(InvaderProjectile(model, invader))
+        self.rocket_projectile_kind = Kind(RocketProjectile(model))
+
+        # Invader's position after AGE moves: its path's prefix sums, plus laps.
+        table = compile_runs(Invader.RUNS)
+        self.path_length = len(table)
+        self.path_prefix = np.array(table.prefix)
+        self.path_lap = table.prefix[-1]
+
+        self.tick       = np.zeros(k, dtype=np.int64)
+        self.rocket_x   = np.zeros(k)
+        self.ready      = np.zeros(k, dtype=np.int64)
+        self.hit_points = np.zeros(k, dtype=np.int64)
+        self.kills      = np.zeros(k, dtype=np.int64)
+
+        self.invaders = Group(k, invaders, {"x": float, "y": float, "age": np.int64, "ready": np.int64})
+        self.invader_projectiles = Group(k, invader_projectiles, {"x": float, "y": float})
+        self.rocket_projectiles = Group(k, rocket_projectiles, {"x": float, "y": float})
+        self.groups = (self.invaders, self.invader_projectiles, self.rocket_projectiles)
+
+        self.observation_size = 3 + 3 * sum(group.capacity for group in self.groups)
+        self.observations = np.zeros((k, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(k, dtype=np.float32)
+
+        # Buttons' bits:
+        self.left  = BITS[pyxel.KEY_LEFT]
+        self.right = BITS[pyxel.KEY_RIGHT]
+        self.up    = BITS[pyxel.KEY_UP]
+
+        self.reset()
+
+    def reset(self, worlds=None):
+        """Start the WORLDS over, a boolean mask, every world if None. Return the
+        observations."""
+        if worlds is None:
+            worlds = np.ones(self.k, dtype=bool)
+        self.tick[worlds]       = 0
+        self.rocket_x[worlds]   = self.rocket_kind.start[0]
+        self.ready[worlds]      = 0
+        self.hit_points[worlds] = self.max_hit_points
+        self.kills[worlds]      = 0
+        for group in self.groups:
+            group.clear(worlds)
+        self.observe()
+        return self.observations
+
+    def step(self, masks):
+        """Advance every world by one tick, with the buttons of MASKS held down."""
+        masks = np.asarray(masks)
+        tick = self.tick
+        invaders = self.invaders
+        invader_projectiles = self.invader_projectiles
+        rocket_projectiles = self.rocket_projectiles
+
+        # Timers: the new invaders are only attached at the end of the tick.
+        spawn = tick % self.invader_period == 0
+
+        # Invaders march, then fire, from where they moved to.
+        invaders.age += invaders.alive
+        (laps, moves) = np.divmod(invaders.age, self.path_length)
+        (x0, y0) = self.invader_kind.start
+        invaders.x = x0 + self.path_prefix[moves, 0] + laps * self.path_lap[0]
+        invaders.y = y0 + self.path_prefix[moves, 1] + laps * self.path_lap[1]
+        fire = invaders.alive & (invaders.ready <= tick[:, None])
+        np.copyto(invaders.ready, tick[:, None] + self.invader_cooldown, where=fire)
+        fired = (np.nonzero(fire), invaders.x[fire], invaders.y[fire])
+
+        invader_projectiles.y += self.invader_projectile_kind.speed
+        rocket_projectiles.y += self.rocket_projectile_kind.speed
+
+        # The rocket moves, left first, as long as it stays on screen, then shoots.
+        x = self.rocket_x
+        hw = self.rocket_kind.size[0] / 2
+        speed = self.rocket_speed
+        left = masks & self.left != 0
+        right = ~left & (masks & self.right != 0)
+        x[left & (x - hw - speed >= 0)] -= speed
+        x[right & (x + hw + speed <= self.width)] += speed
+        shoot = (masks & self.up != 0) & (tick >= self.ready)
+        self.ready[shoot] = tick[shoot] + self.rocket_cooldown
+
+        invaders.cull(self.invader_kind, self.width, self.height)
+        invader_projectiles.cull(self.invader_projectile_kind, self.width, self.height)
+        rocket_projectiles.cull(self.rocket_projectile_kind, self.width, self.height)
+
+        kills = self.shoot_down()
+        hits = self.hit_rocket(invaders, self.invader_kind)
+        hits += self.hit_rocket(invader_projectiles, self.invader_projectile_kind)
+
+        # End of the tick: the destroyed sprites are dropped, the new ones attached.
+        for group in self.groups:
+            group.compact()
+        (worlds,) = np.nonzero(spawn)
+        (x0, y0) = self.invader_kind.start
+        invaders.add(worlds, 0, x=x0, y=y0, age=0, ready=0)
+        ((worlds, slots), fx, fy) = fired
+        ranks = (np.cumsum(fire, axis=1) - 1)[worlds, slots]
+        invader_projectiles.add(worlds, ranks, x=fx, y=fy)
+        (worlds,) = np.nonzero(shoot)
+        rocket_projectiles.add(worlds, 0, x=x[worlds], y=self.rocket_kind.start[1])
+        tick += 1
+
+        np.multiply(kills, KILL_REWARD, out=self.rewards)
+        self.rewards += hits * HIT_REWARD
+        self.kills += kills
+        dones = self.hit_points == 0
+        if dones.any():
+            self.reset(dones)
+        else:
+            self.observe()
+        return (self.observations, self.rewards, dones)
+
+    def shoot_down(self):
+        """Rocket projectiles against invaders. Return the kills of each world.
+
+        Pairs are walked projectile after projectile, invader after invader: a
+        projectile shoots down the first invader it hits, unless already shot.
+
+        """
+        projectiles = self.rocket_projectiles
+        invaders = self.invaders
+        kills = np.zeros(self.k, dtype=np.int64)
+        live = np.flatnonzero(projectiles.alive.any(axis=0))
+        if len(live) == 0:
+            return kills
+        (px, py, pw, ph) = projectiles.boxes(self.rocket_projectile_kind.size)
+        (ix, iy, iw, ih) = invaders.boxes(self.invader_kind.size)
+        p = (px[:, live, None], py[:, live, None], pw, ph)
+        i = (ix[:, None, :], iy[:, None, :], iw, ih)
+        hits = overlap(p, i) & projectiles.alive[:, live, None]
+
+        for (n, j) in enumerate(live.tolist()):
+            row = hits[:, n, :] & invaders.alive
+            (worlds,) = np.nonzero(row.any(axis=1))
+            if len(worlds) == 0:
+                continue
+            invaders.alive[worlds, row[worlds].argmax(axis=1)] = False
+            projectiles.alive[worlds, j] = False
+            kills[worlds] += 1
+        return kills
+
+    def hit_rocket(self, group, kind):
+        """GROUP's sprites, of KIND, against the rocket: every sprite hitting it is
+        destroyed, and takes 2 hit points, until the rocket is dead. Return the
+        hits of each world."""
+        (w, h) = self.rocket_kind.size
+        rocket = ((self.rocket_x - w / 2)[:, None], self.rocket_kind.start[1] - h / 2, w, h)
+        touching = overlap(group.boxes(kind.size), rocket) & group.alive
+
+        # The rocket is destroyed by its last hit point: the sprites after don't hit it.
+        hits = np.minimum(touching.sum(axis=1), (self.hit_points + 1) // 2)
+        group.alive &= ~(touching & (np.cumsum(touching, axis=1) <= hits[:, None]))
+        np.maximum(self.hit_points - 2 * hits, 0, out=self.hit_points)
+        return hits
+
+    def observe(self):
+        """Write the observations of every world, see the class' docstring."""
+        obs = self.observations
+        x = self.rocket_x[:, None]
+        np.multiply(self.rocket_x, 1 / self.width, out=obs[:, 0])
+        np.multiply(self.hit_points, 1 / self.max_hit_points, out=obs[:, 1])
+        np.greater_equal(self.tick, self.ready, out=obs[:, 2])
+        start = 3
+        for group in self.groups:
+            n = group.capacity
+            (dx, dy, alive) = (obs[:, start:start + n], obs[:, start + n:start + 2 * n],
+                               obs[:, start + 2 * n:start + 3 * n])
+            alive[:] = group.alive
+            np.subtract(group.x, x, out=dx)
+            dx *= alive
+            dx *= 1 / self.width
+            np.subtract(group.y, self.rocket_kind.start[1], out=dy)
+            dy *= alive
+            dy *= 1 / self.height
+            start += 3 * n
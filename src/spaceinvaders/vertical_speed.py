@@ -2,5 +2,7 @@ from spaceinvaders.vector import Vector
 
 
 class VerticalSpeed(Vector):
+    __slots__ = ()
+
     def __init__(self, speed):
         super().__init__(0, speed)
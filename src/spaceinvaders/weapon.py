@@ -1,21 +1,21 @@
-from spaceinvaders.sprite_manager import SpriteManager
-
 
 class Weapon:
+    """A weapon firing projectiles in WORLD, at most every COOLDOWN ticks."""
 
-    def __init__(self, cooldown):
-        self.cooldown_reload = cooldown
-        self.cooldown_current = 0
+    def __init__(self, world, cooldown):
+        self.world = world
+        self.cooldown = cooldown
+        self.reset()
 
-    def update(self):
-        if self.cooldown_current > 0:
-            self.cooldown_current -= 1
+    def reset(self):
+        """Make the weapon ready to fire."""
+        self.ready_tick = 0
 
     def reload(self):
-        self.cooldown_current = self.cooldown_reload
+        self.ready_tick = self.world.tick + self.cooldown
 
     def ready(self):
-        return self.cooldown_current == 0
+        return self.world.tick >= self.ready_tick
 
     def projectile(self):
         raise NotImplementedError()
@@ -24,6 +24,6 @@ class Weapon:
     def fire(self):
         if not self.ready():
             return False
-        SpriteManager().attach(self.projectile())
+        self.world.manager.attach(self.projectile())
         self.reload()
         return True
@@ -0,0 +1,70 @@
+
+from spaceinvaders.controls           import Controls
+from spaceinvaders.invader            import Invader
+from spaceinvaders.invader_explosion  import InvaderExplosion
+from spaceinvaders.invader_projectile import InvaderProjectile
+from spaceinvaders.life_bar           import LifeBar
+from spaceinvaders.rng                import RNG
+from spaceinvaders.rocket             import Rocket
+from spaceinvaders.rocket_projectile  import RocketProjectile
+from spaceinvaders.sprite_manager     import SpriteManager
+from spaceinvaders.star               import Star
+from spaceinvaders.ufo                import UFO
+
+# Ticks between two spawns, i.e., the difficulty of the waves:
+INVADER_PERIOD = 30
+STAR_PERIOD    = 0.5
+UFO_PERIOD     = 240
+
+
+class World:
+    """One game: its sprite manager, rocket, life bar, random number generator
+    and tick counter, along with the CONTROLS the rocket is flown with.
+
+    Worlds share nothing, so that many of them can be stepped in the same
+    process, e.g., hundreds of headless games in one loop. Sprites are built for
+    a world and reach everything through it, e.g., self.world.manager.
+
+    The world is seeded with SEED, a random one if None. Its sprites live in the
+    structure-of-arrays storage if SOA, or if World.soa when SOA is None.
+
+    """
+
+    # Default storage of new worlds, see --soa.
+    soa = False
+
+    def __init__(self, seed=None, controls=None, soa=None):
+        self.rng = RNG(seed)
+        self.seed = self.rng.seed_value
+        self.controls = Controls() if controls is None else controls
+        self.manager = SpriteManager(self, self.soa if soa is None else soa)
+        self.rocket = Rocket(self)
+        self.life_bar = LifeBar(self)
+
+        manager = self.manager
+        manager.spawn(Invader, INVADER_PERIOD)
+        manager.spawn(Star,    STAR_PERIOD)
+        manager.attach(self.rocket)
+        manager.attach(self.life_bar)
+        manager.spawn(UFO, UFO_PERIOD)
+        manager.collide("RocketProjectile",  "Invader")
+        manager.collide("Invader",           "Rocket")
+        manager.collide("InvaderProjectile", "Rocket")
+        manager.pool(Star,              256)
+        manager.pool(RocketProjectile,  64)
+        manager.pool(InvaderProjectile, 64)
+        manager.pool(InvaderExplosion,  32)
+
+    @property
+    def tick(self):
+        """Ticks the world was stepped, i.e., its manager's updates."""
+        return self.manager.scheduler.tick
+
+    def is_over(self):
+        return self.life_bar.is_dead()
+
+    def step(self, mask=None):
+        """Advance the world by one tick, with the buttons of MASK held down (see
+        controls.BUTTONS), sampled from the controls if None."""
+        self.controls.poll(mask)
+        self.manager.update()